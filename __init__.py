@@ -1,6 +1,16 @@
+import logging
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN, PLATFORMS
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from .const import DOMAIN, PLATFORMS, SIGNAL_DEVICES_UPDATED
+from .helpers.devices import close_device_index, split_options
+from .metrics import async_setup_metrics_view
+from .passive_discovery import async_setup_passive_discovery
+from .services import async_setup_services
+from .somfy.utils.session import close_async_legacy_session
+
+logger = logging.getLogger("Somfy")
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -8,10 +18,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = config
+    config["passive_discovery"] = async_setup_passive_discovery(hass, entry)
+    config["device_options"], config["settings"] = split_options(entry.options)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    await async_setup_services(hass)
+    async_setup_metrics_view(hass)
 
     return True
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
+    """Apply option changes to the devices they touch; the rest of the entry keeps running."""
+    config = hass.data[DOMAIN][entry.entry_id]
+    devices, settings = split_options(entry.options)
+    if settings != config["settings"]:
+        # Entry-wide settings such as the subnet are only read at setup.
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    previous = config["device_options"]
+    added = devices.keys() - previous.keys()
+    removed = previous.keys() - devices.keys()
+    changed = {device_id for device_id in devices.keys() & previous.keys() if devices[device_id] != previous[device_id]}
+    if not added and not removed and not changed:
+        return
+
+    logger.info("Devices updated: %s added, %s removed, %s changed", len(added), len(removed), len(changed))
+    for device_id in removed:
+        config.pop(device_id, None)
+        config.get("metrics", {}).pop(device_id, None)
+    config.update({device_id: devices[device_id] for device_id in added | changed})
+    config["device_options"] = devices
+
+    async_dispatcher_send(hass, SIGNAL_DEVICES_UPDATED.format(entry.entry_id), added, removed, changed)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+    if unload_ok:
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id, {})
+        if entry_data.get("passive_discovery"):
+            await entry_data["passive_discovery"].stop()
+        # Shade clients share one connection pool; release it with the last entry.
+        if not hass.data[DOMAIN]:
+            await close_async_legacy_session()
+            close_device_index(hass)
+
+    return unload_ok
@@ -0,0 +1,216 @@
+"""Offline benchmarks against simulated controllers.
+
+    python -m benchmarks.bench commands --shades 50 --commands 2000
+    python -m benchmarks.bench scan --prefixes 26 24 22
+    python -m benchmarks.bench poll --sizes 10 100 500
+    python -m benchmarks.bench arp --arp-latency 0.002
+    python -m benchmarks.bench all
+
+Run from the repository root. The fake controllers run in a child process,
+so the CPU times reported are the integration's own.
+"""
+import argparse
+import asyncio
+import ipaddress
+import logging
+import math
+import time
+
+from somfy.classes.ArpHostClient import ArpHostClient
+from somfy.classes.ArpHostServer import ArpHostServer
+from somfy.classes.AsyncSomfyPoeBlindClient import AsyncSomfyPoeBlindClient
+from somfy.classes.ClientMetrics import percentile
+from somfy.classes.Scanner import Scanner
+from somfy.classes.ShadeGroup import ShadeGroup
+from somfy.classes.StatusPoller import StatusPoller, DEFAULT_POLL_STAGGER
+from somfy.utils.session import close_async_legacy_session
+
+from .fake_controller import FakeSomfyProcess, FaultProfile, raise_fd_limit
+
+logger = logging.getLogger("Benchmark")
+
+
+def _latencies(clients, method: str) -> list[float]:
+    return [
+        sample for client in clients
+        for sample in (client.metrics.latency[method].samples if method in client.metrics.latency else ())
+    ]
+
+
+def _mac(index: int, prefix: str = "4C:C2:06") -> str:
+    return prefix + ":" + ":".join(f"{b:02X}" for b in index.to_bytes(3, "big"))
+
+
+def _format_ms(samples) -> str:
+    return " ".join(f"p{q}={percentile(samples, q) * 1000:.1f}ms" for q in (50, 95, 99)) if samples else "-"
+
+
+async def bench_commands(devices: list[dict], commands: int, concurrency: int):
+    clients = [AsyncSomfyPoeBlindClient.init_with_device(device) for device in devices]
+    group = ShadeGroup(clients, max_concurrency=concurrency)
+    # Log every client in first so the run measures steady-state commands.
+    await group.send_command("status.position")
+
+    rounds = max(1, math.ceil(commands / len(clients)))
+    failed = 0
+    started, cpu = time.perf_counter(), time.process_time()
+    for index in range(rounds):
+        results = await group.move(0 if index % 2 else 100)
+        failed += sum(1 for result in results if not result.success)
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu
+
+    sent = rounds * len(clients)
+    print(
+        f"commands: {sent} move.to to {len(clients)} shades, fan-out {concurrency}: "
+        f"{sent / elapsed:.0f} cmd/s, {cpu / sent * 1000:.3f}ms CPU/cmd, {failed} failed, "
+        f"{_format_ms(_latencies(clients, 'move.to'))}"
+    )
+
+
+class SimulatedScanner(Scanner):
+    """Scanner whose ping and ARP lookups are answered from an ip -> mac map.
+
+    Live hosts reply after `reply_time`; every other address costs a full
+    ping timeout, which is what dominates a real sweep.
+    """
+
+    def __init__(self, subnet, macs: dict[str, str], reply_time: float, ping_timeout: float, concurrency: int, **kwargs):
+        super().__init__(subnet, concurrency=concurrency, ping_timeout=ping_timeout, use_neighbor_table=False, **kwargs)
+        self.macs = macs
+        self.reply_time = reply_time
+
+    async def ping(self, ip) -> bool:
+        if ip in self.macs:
+            await asyncio.sleep(self.reply_time)
+            return True
+
+        await asyncio.sleep(self.ping_timeout)
+        return False
+
+    async def get_mac_async(self, ip: str) -> str | None:
+        return self.macs.get(ip)
+
+
+async def bench_scan(prefixes: list[int], shades: int, concurrency: int, reply_time: float, ping_timeout: float):
+    for prefix in prefixes:
+        network = ipaddress.IPv4Network(f"10.99.0.0/{prefix}")
+        hosts = list(network.hosts())
+        step = max(1, len(hosts) // shades)
+        macs = {str(ip): _mac(index) for index, ip in enumerate(hosts[::step][:shades], 1)}
+
+        async with SimulatedScanner(str(network), macs, reply_time, ping_timeout, concurrency) as scanner:
+            started, cpu = time.perf_counter(), time.process_time()
+            found = [ip async for ip, _ in scanner.get_devices()]
+            elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu
+
+        print(
+            f"scan: /{prefix} ({len(hosts)} hosts), concurrency {concurrency}: {elapsed:.2f}s, "
+            f"{len(hosts) / elapsed:.0f} hosts/s, {cpu * 1000:.0f}ms CPU, found {len(found)}/{len(macs)}"
+        )
+
+
+async def bench_arp(port: int, latency: float, concurrency: int, reply_time: float):
+    """Per-IP GET /arp/<ip> against batched POST /arp, over a /24 where every host answers."""
+    network = ipaddress.IPv4Network("10.99.0.0/24")
+    hosts = [str(ip) for ip in network.hosts()]
+    # Every neighbor has an ARP entry; one in ten is a shade.
+    fixtures = {ip: _mac(index, "4C:C2:06" if index % 10 == 0 else "02:00:00") for index, ip in enumerate(hosts, 1)}
+
+    async with ArpHostServer(port=port, fixtures=fixtures, latency=latency) as server:
+        for batched in (False, True):
+            mode = "batched" if batched else "per-ip"
+
+            client = ArpHostClient(server.url, limit=min(concurrency, 16))
+            client.batch_supported = batched
+            started = time.perf_counter()
+            macs = await asyncio.gather(*(client.lookup(ip) for ip in hosts))
+            elapsed = time.perf_counter() - started
+            await client.close()
+            print(f"arp lookups: {len(hosts)} IPs {mode}: {elapsed * 1000:.0f}ms, {sum(1 for mac in macs if mac)} resolved")
+
+            async with SimulatedScanner(
+                str(network), fixtures, reply_time, reply_time, concurrency, use_mac_mock=True, base_url=server.url
+            ) as scanner:
+                scanner.arp_host.batch_supported = batched
+                started = time.perf_counter()
+                found = [ip async for ip, _ in scanner.get_devices()]
+                elapsed = time.perf_counter() - started
+            print(f"arp sweep: /24 {mode}, concurrency {concurrency}: {elapsed * 1000:.0f}ms, found {len(found)}")
+
+
+async def bench_poll(devices: list[dict], sizes: list[int], rounds: int, stagger: float):
+    for size in sizes:
+        clients = {index: AsyncSomfyPoeBlindClient.init_with_device(device) for index, device in enumerate(devices[:size])}
+        poller = StatusPoller(stagger=stagger)
+        await poller.poll(clients)
+
+        walls, cpus, missing = [], [], 0
+        for _ in range(rounds):
+            started, cpu = time.perf_counter(), time.process_time()
+            statuses = await poller.poll(clients)
+            walls.append(time.perf_counter() - started)
+            cpus.append(time.process_time() - cpu)
+            missing += sum(1 for status in statuses.values() if status is None)
+
+        wall, cpu = sum(walls) / rounds, sum(cpus) / rounds
+        print(
+            f"poll: {size} shades, stagger {stagger}s: {wall:.2f}s wall, {cpu * 1000:.1f}ms CPU "
+            f"({cpu / size * 1000:.3f}ms/shade), {missing} missing, "
+            f"{_format_ms(_latencies(clients.values(), 'status.position'))}"
+        )
+
+
+async def run(args):
+    try:
+        if args.benchmark in ("scan", "all"):
+            await bench_scan(args.prefixes, args.scan_shades, args.concurrency, args.reply_time, args.ping_timeout)
+
+        if args.benchmark in ("arp", "all"):
+            await bench_arp(args.arp_port, args.arp_latency, args.concurrency, args.reply_time)
+
+        if args.benchmark in ("commands", "poll", "all"):
+            count = max(args.shades, *args.sizes) if args.benchmark != "commands" else args.shades
+            profile = FaultProfile(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, timeout_rate=args.timeout_rate)
+            with FakeSomfyProcess(count, profile=profile, seed=1) as fake:
+                devices = fake.devices()
+                if args.benchmark in ("commands", "all"):
+                    await bench_commands(devices[:args.shades], args.commands, args.fan_out)
+                if args.benchmark in ("poll", "all"):
+                    await bench_poll(devices, args.sizes, args.rounds, args.stagger)
+    finally:
+        await close_async_legacy_session()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Somfy clients against simulated controllers.")
+    parser.add_argument("benchmark", choices=("commands", "scan", "poll", "arp", "all"))
+    parser.add_argument("--latency", type=float, default=0.02, help="controller response time in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--shades", type=int, default=50, help="shades in the command benchmark")
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--fan-out", type=int, default=32)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="shade counts to poll")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--stagger", type=float, default=DEFAULT_POLL_STAGGER)
+    parser.add_argument("--prefixes", type=int, nargs="+", default=[26, 24, 22], help="subnet sizes to sweep")
+    parser.add_argument("--scan-shades", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--reply-time", type=float, default=0.005)
+    parser.add_argument("--ping-timeout", type=float, default=0.25, help="scaled-down cost of a dead address")
+    parser.add_argument("--arp-port", type=int, default=5099)
+    parser.add_argument("--arp-latency", type=float, default=0.002, help="ARP host response time in seconds")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.ERROR,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    raise_fd_limit()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""Simulated Somfy PoE controllers for benchmarks, without real hardware.
+
+Every shade listens on its own loopback address (127.42.0.1, 127.42.0.2, ...)
+so the clients' per-host pools, cookie jars and TLS resumption behave as they
+do on a real network. Linux routes all of 127.0.0.0/8 to lo; other systems
+need the aliases added first.
+
+Run standalone with `python -m benchmarks.fake_controller --count 20`.
+"""
+import argparse
+import asyncio
+import ipaddress
+import logging
+import multiprocessing
+import os
+import random
+import secrets
+import ssl
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from aiohttp import web
+
+logger = logging.getLogger("Fake Controller")
+
+DEFAULT_NETWORK = "127.42.0.0/16"
+DEFAULT_PORT = 8443
+DEFAULT_PIN = "1234"
+# Percent of travel per second; a full run takes about 20s like a real motor.
+DEFAULT_SPEED = 5.0
+
+LOGIN_PAGE = "<html><head><title>SOMFY PoE WebGUI</title></head><body><form method='post'></form></body></html>"
+
+
+@dataclass
+class FaultProfile:
+    """Latency and failures injected into every /req call; rates are per request, 0-1."""
+    latency: float = 0.02
+    jitter: float = 0.01
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    expire_rate: float = 0.0
+    drop_rate: float = 0.0
+    # How long a "timed out" request hangs before it is answered.
+    hang_time: float = 30.0
+
+
+@dataclass
+class FakeShade:
+    """One controller and its motor. Positions are raw: 0 open, 100 closed."""
+    ip: str
+    mac: str
+    name: str
+    pin: str = DEFAULT_PIN
+    speed: float = DEFAULT_SPEED
+    position: float = 0.0
+    target: Optional[float] = None
+    moved_at: float = field(default_factory=time.monotonic)
+    sessions: set = field(default_factory=set)
+
+    def position_at(self, now: float) -> float:
+        if self.target is None:
+            return self.position
+
+        travelled = self.speed * (now - self.moved_at)
+        if abs(self.target - self.position) <= travelled:
+            return self.target
+
+        return self.position + travelled * (1 if self.target > self.position else -1)
+
+    def _settle(self, now: float):
+        self.position = self.position_at(now)
+        if self.target is not None and self.position == self.target:
+            self.target = None
+        self.moved_at = now
+
+    def move(self, target: Optional[float]):
+        self._settle(time.monotonic())
+        self.target = None if target is None or target == self.position else float(target)
+
+    def status(self) -> dict:
+        self._settle(time.monotonic())
+        moving = self.target is not None
+        return {
+            "targetID": self.mac.replace(":", "").lower(),
+            "position": {
+                "cause": "move request" if moving else "target reached",
+                "direction": "down / close" if moving and self.target > self.position else "up / open",
+                "source": "internal",
+                "status": "ok",
+                "value": round(self.position),
+            },
+        }
+
+    def info(self) -> dict:
+        return {
+            "info": {
+                "ip": self.ip,
+                "mac": self.mac,
+                "firmware": "1.4.2-fake",
+                "hardware": "PoE Motor Controller",
+                "hostname": f"somfy-{self.mac[-5:].replace(':', '').lower()}",
+                "model": "Sonesse 30 PoE",
+                "name": self.name,
+            }
+        }
+
+    def handle(self, method: str, params: dict) -> dict:
+        if method == "status.position":
+            return self.status()
+        if method == "status.info":
+            return self.info()
+        if method == "move.up":
+            self.move(0)
+        elif method == "move.down":
+            self.move(100)
+        elif method == "move.to":
+            self.move(max(0, min(100, params.get("position", self.position))))
+        elif method == "move.stop":
+            self.move(None)
+        else:
+            return {"targetID": self.mac.replace(":", "").lower(), "result": False, "error": {"title": f"unknown method {method}"}}
+
+        return {"targetID": self.mac.replace(":", "").lower(), "result": True}
+
+
+def create_server_ssl_context(directory: str) -> ssl.SSLContext:
+    """Self-signed TLS 1.2-only context, like the controllers' embedded web server."""
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=somfy-fake", "-keyout", keyfile, "-out", certfile,
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+    ctx.maximum_version = ssl.TLSVersion.TLSv1_2
+    ctx.load_cert_chain(certfile, keyfile)
+    return ctx
+
+
+class FakeSomfyNetwork:
+    """`count` simulated controllers sharing one aiohttp application."""
+
+    def __init__(
+        self,
+        count: int,
+        network: str = DEFAULT_NETWORK,
+        port: int = DEFAULT_PORT,
+        pin: str = DEFAULT_PIN,
+        profile: Optional[FaultProfile] = None,
+        seed: Optional[int] = None,
+    ):
+        self.port = port
+        self.pin = pin
+        self.profile = profile or FaultProfile()
+        self.random = random.Random(seed)
+        self.shades: dict[str, FakeShade] = {}
+        hosts = ipaddress.IPv4Network(network).hosts()
+        for index in range(count):
+            ip = str(next(hosts))
+            mac = "4C:C2:06:" + ":".join(f"{b:02X}" for b in (index + 1).to_bytes(3, "big"))
+            self.shades[ip] = FakeShade(ip=ip, mac=mac, name=f"Fake Shade {index + 1}", pin=pin)
+        self._runner: Optional[web.AppRunner] = None
+        self._tmp: Optional[tempfile.TemporaryDirectory] = None
+
+    def address(self, ip: str) -> str:
+        """What a client uses as the shade's "ip"."""
+        return ip if self.port == 443 else f"{ip}:{self.port}"
+
+    def devices(self) -> list[dict]:
+        """Device options as stored by the config flow, ready for init_with_device."""
+        return [{"name": shade.name, "ip": self.address(ip), "pin": shade.pin} for ip, shade in self.shades.items()]
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def start(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        ssl_context = create_server_ssl_context(self._tmp.name)
+
+        app = web.Application()
+        app.router.add_post("/", self._handle_login)
+        app.router.add_post("/req", self._handle_request)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        for ip in self.shades:
+            await web.TCPSite(self._runner, ip, self.port, ssl_context=ssl_context, backlog=512).start()
+        logger.info("Serving %s fake shades on port %s", len(self.shades), self.port)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def _get_shade(self, request: web.Request) -> FakeShade:
+        return self.shades[request.transport.get_extra_info("sockname")[0]]
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        shade = self._get_shade(request)
+        form = await request.post()
+        response = web.Response(text=LOGIN_PAGE, content_type="text/html")
+        if form.get("password") == shade.pin:
+            token = secrets.token_hex(8)
+            shade.sessions.add(token)
+            response.set_cookie("sessionId", token, path="/")
+
+        return response
+
+    async def _handle_request(self, request: web.Request) -> web.StreamResponse:
+        shade = self._get_shade(request)
+        profile = self.profile
+        await asyncio.sleep(max(0.0, profile.latency + self.random.uniform(-profile.jitter, profile.jitter)))
+
+        roll = self.random.random()
+        if roll < profile.drop_rate:
+            request.transport.close()
+            return web.Response(status=500)
+        roll -= profile.drop_rate
+        if roll < profile.timeout_rate:
+            await asyncio.sleep(profile.hang_time)
+        roll -= profile.timeout_rate
+        if roll < profile.error_rate:
+            return web.Response(status=500, text="Internal Server Error")
+        roll -= profile.error_rate
+        if roll < profile.expire_rate:
+            shade.sessions.clear()
+
+        if request.cookies.get("sessionId") not in shade.sessions:
+            # Like the real controller, an unknown session gets the login page back.
+            return web.Response(text=LOGIN_PAGE, content_type="text/html")
+
+        payload = await request.json()
+        return web.json_response(shade.handle(payload.get("method"), payload.get("params") or {}))
+
+
+def _serve(count, network, port, pin, profile, seed, ready, stop):
+    async def run():
+        async with FakeSomfyNetwork(count, network, port, pin, profile, seed):
+            ready.set()
+            while not stop.is_set():
+                await asyncio.sleep(0.1)
+
+    raise_fd_limit()
+    asyncio.run(run())
+
+
+class FakeSomfyProcess:
+    """A FakeSomfyNetwork in a child process, so the caller's CPU time is its own."""
+
+    def __init__(self, count: int, network: str = DEFAULT_NETWORK, port: int = DEFAULT_PORT,
+                 pin: str = DEFAULT_PIN, profile: Optional[FaultProfile] = None, seed: Optional[int] = None):
+        # Built locally only to know the addresses; the child builds the same shades.
+        self.network = FakeSomfyNetwork(count, network, port, pin, profile, seed)
+        self._args = (count, network, port, pin, profile, seed)
+        self._context = multiprocessing.get_context("spawn")
+        self._ready = self._context.Event()
+        self._stop = self._context.Event()
+        self._process = None
+
+    def devices(self) -> list[dict]:
+        return self.network.devices()
+
+    def __enter__(self):
+        self._process = self._context.Process(target=_serve, args=(*self._args, self._ready, self._stop), daemon=True)
+        self._process.start()
+        if not self._ready.wait(60):
+            self._process.kill()
+            raise RuntimeError("Fake controllers did not start")
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._process.join(10)
+        if self._process.is_alive():
+            self._process.kill()
+
+
+def raise_fd_limit():
+    """Every shade needs a listening socket plus pooled connections on both ends."""
+    try:
+        import resource
+    except ImportError:
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = 65536 if hard == resource.RLIM_INFINITY else hard
+    if soft != resource.RLIM_INFINITY and soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve simulated Somfy PoE controllers.")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--network", default=DEFAULT_NETWORK)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--pin", default=DEFAULT_PIN)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--expire-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    profile = FaultProfile(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate, expire_rate=args.expire_rate, drop_rate=args.drop_rate,
+    )
+    network = FakeSomfyNetwork(args.count, args.network, args.port, args.pin, profile)
+    for device in network.devices():
+        logger.info("%s at %s (pin %s)", device["name"], device["ip"], device["pin"])
+
+    async def run():
+        async with network:
+            await asyncio.Event().wait()
+
+    raise_fd_limit()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from typing import Tuple
 
@@ -11,8 +10,11 @@ from homeassistant.helpers.device_registry import DeviceEntry
 
 from .somfy.classes.SomfyPoeBlindClient import SomfyPoeBlindClient
 from .const import DOMAIN
-from .helpers.devices import get_devices_for_entry
+from .discovery_cache import DiscoveryCache
+from .passive_discovery import get_passive_discovery, get_passive_discovery_for_ip
+from .helpers.devices import get_devices_for_entry, get_or_create_draft_device
 from .somfy.dtos.somfy_objects import Device
+from .somfy.classes.DeviceEnricher import DeviceEnricher
 from .somfy.classes.Scanner import Scanner
 
 logger = logging.getLogger("Somfy")
@@ -44,6 +46,15 @@ class SomfyIntegrationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             })
         )
 
+    async def async_step_dhcp(self, discovery_info):
+        """A shade asked for a DHCP lease; hand it to the entry that owns its subnet."""
+        passive = get_passive_discovery_for_ip(self.hass, discovery_info.ip)
+        if passive is None:
+            return self.async_abort(reason="not_in_configured_subnet")
+
+        passive.add(discovery_info.ip, discovery_info.macaddress)
+        return self.async_abort(reason="already_configured")
+
     @staticmethod
     def async_get_options_flow(config_entry):
         return DeviceOptionsFlowHandler(config_entry)
@@ -66,6 +77,7 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
             step_id="init",
             menu_options={
                 "start_discovery": "Start Discovery",
+                "rescan_known": "Rescan Known Devices",
                 "edit_settings": "Edit Settings",
                 "add_device": "Add Device",
                 "edit_device": "Edit Device",
@@ -88,22 +100,24 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
 
         return choices, device_by_id
 
-    def reload(self):
-        async def _reload_entry_later():
-            await asyncio.sleep(0)  # yield to let the flow finish
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-
-        self.hass.async_create_task(_reload_entry_later())
-
     async def async_step_start_discovery(self, user_input=None):
+        """Sweep the whole subnet, so shades installed since the last sweep are found too."""
         logger.info("start discovery called")
+        return self._show_discovery_progress("start_discovery", full_sweep=True)
 
+    async def async_step_rescan_known(self, user_input=None):
+        """Re-verify known shades; the subnet is swept only if one moved or the last sweep expired."""
+        logger.info("rescan known devices called")
+        return self._show_discovery_progress("rescan_known", full_sweep=False)
+
+    def _show_discovery_progress(self, step_id, full_sweep):
         if not self.discovery_task:
-            self.discovery_task = self.hass.async_create_task(self.discover_devices())
+            self.discovery_task = self.hass.async_create_task(self.discover_devices(full_sweep))
 
         if not self.discovery_task.done():
             progress_action = "start_discovery"
             return self.async_show_progress(
+                step_id=step_id,
                 progress_action=progress_action,
                 progress_task=self.discovery_task,
                 description_placeholders={
@@ -113,34 +127,103 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_progress_done(next_step_id="discovery_done")
 
-    async def discover_devices(self):
+    async def discover_devices(self, full_sweep=True):
         logger.info(f'discovering devices on {self.subnet}')
         try:
-            new_devices = await self.get_devices()
+            new_devices = await self.get_devices(full_sweep)
             self.discovered_devices = new_devices
         except Exception as e:
             logger.exception(f"unable to get devices {e}")
+        finally:
+            await self.scanner.close()
 
 
-    async def get_devices(self):
+    async def get_devices(self, full_sweep=True):
         new_devices = dict(self.config_entry.options)
         check_counter = 0
         devices_count = 0
 
-        async for (ip, mac) in self.scanner.get_devices():
+        cache = DiscoveryCache(self.hass, self.config_entry.entry_id)
+        await cache.async_load()
+
+        # Configured and passively seen devices are known too, even before they were ever cached.
+        firmware_by_mac = {}
+        known = cache.known_ips()
+        passive = get_passive_discovery(self.hass, self.config_entry.entry_id)
+        if passive is not None:
+            known.update(passive.known_ips())
+        for options in new_devices.values():
+            if isinstance(options, dict) and options.get("ip") and options.get("mac"):
+                known.setdefault(options["ip"], options["mac"])
+                firmware_by_mac[options["mac"]] = options.get("firmware")
+
+        candidates = {}
+
+        async def add_device(ip, mac):
             draft_device = await self.create_draft_device(ip, mac)
             new_devices[draft_device.id] = {
+                **new_devices.get(draft_device.id, {}),
                 "ip": ip,
                 "mac": mac,
             }
-            devices_count += 1
+            cache.seen(ip, mac, firmware_by_mac.get(mac))
+            if not new_devices[draft_device.id].get("pin"):
+                candidates[ip] = draft_device.id
+
+        verified = set()
+        async for (ip, mac) in self.scanner.verify_devices(known):
+            await add_device(ip, mac)
+            verified.add(ip)
+        logger.info(f'Verified {len(verified)} of {len(known)} known devices.')
+
+        for ip in set(known) - verified:
+            cache.forget(known[ip])
+
+        # A quick rescan sweeps the rest of the subnet only when a known device moved or the last sweep expired.
+        if full_sweep or len(verified) < len(known) or cache.needs_sweep(self.subnet):
+            async for (ip, mac) in self.scanner.get_devices(exclude=verified):
+                await add_device(ip, mac)
+                devices_count += 1
+
+                check_counter += 1
+                if check_counter % 30 == 0:
+                    logger.info(f'Checked {check_counter} devices.')
+                    logger.info(f'Found {devices_count} devices.')
+
+            cache.mark_swept(self.subnet)
+
+        await self.enrich_devices(new_devices, candidates, cache)
+        await cache.async_save()
+        return new_devices
 
-            check_counter += 1
-            if check_counter % 30 == 0:
-                logger.info(f'Checked {check_counter} devices.')
-                logger.info(f'Found {devices_count} devices.')
+    async def enrich_devices(self, new_devices, candidates, cache):
+        """Log in to every draft concurrently with the PINs already in use and fill in status.info."""
+        pins = [options["pin"] for options in new_devices.values() if isinstance(options, dict) and options.get("pin")]
+        if not pins or not candidates:
+            return
+
+        enriched = 0
+        enricher = DeviceEnricher(pins)
+        drafts = {ip: new_devices[device_id]["mac"] for ip, device_id in candidates.items()}
+        async for (ip, mac, pin, device_info) in enricher.enrich(drafts):
+            if device_info is None:
+                continue
+
+            draft_id = candidates[ip]
+            device_info.mac = device_info.mac or mac
+            device = self._register_device(device_info)
+            if device.id != draft_id:
+                await self.remove_device_by_id(draft_id)
+                new_devices.pop(draft_id, None)
+
+            new_devices[device.id] = {
+                "pin": pin,
+                **device_info.to_dict(),
+            }
+            cache.seen(ip, mac, device_info.firmware)
+            enriched += 1
 
-        return new_devices
+        logger.info(f'Enriched {enriched} of {len(candidates)} draft devices.')
 
     async def async_step_discovery_done(self, user_input=None):
         devices = {
@@ -148,7 +231,7 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
             **self.discovered_devices
         }
 
-        self.reload()
+        # The entry's update listener sets up only the devices that changed.
         return self.async_create_entry(title="", data=devices)
 
     @callback
@@ -156,6 +239,7 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
         """Clean up resources or tasks associated with the flow."""
         if self.discovery_task:
             self.discovery_task.cancel()
+        self.hass.async_create_task(self.scanner.close())
 
     async def async_step_add_device(self, user_input=None):
         if user_input is not None:
@@ -166,8 +250,6 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
                 **device_info.to_dict(),
             }
 
-            # Schedule reload after this flow completes
-            self.reload()
             return self.async_create_entry(title="", data=devices)
 
         return self.async_show_form(
@@ -179,32 +261,27 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
         )
 
     async def create_draft_device(self, ip, mac):
-        device_registry = dr.async_get(self.hass)
-        return device_registry.async_get_or_create(
-            config_entry_id=self.config_entry.entry_id,
-            identifiers={(self.config_entry.domain, mac)},
-            name=f"Draft {ip} - {mac}",
-            manufacturer="Somfy",
-            configuration_url=f"https://{ip}",
-        )
+        return get_or_create_draft_device(self.hass, self.config_entry, ip, mac)
 
     async def _create_device(self, user_input) -> Tuple[DeviceEntry, Device]:
-        device_registry = dr.async_get(self.hass)
         client = SomfyPoeBlindClient("Draft", user_input["ip"], user_input["pin"], lambda _: None)
         await self.hass.async_add_executor_job(client.login)
         device_info = await self.hass.async_add_executor_job(client.get_info)
 
-        device = device_registry.async_get_or_create(
+        return self._register_device(device_info), device_info
+
+    def _register_device(self, device_info: Device) -> DeviceEntry:
+        device_registry = dr.async_get(self.hass)
+        return device_registry.async_get_or_create(
             config_entry_id=self.config_entry.entry_id,
             identifiers={(self.config_entry.domain, device_info.mac)},
             name=device_info.name or "Untitled",
             manufacturer="Somfy",
             model=device_info.model,
+            sw_version=device_info.firmware,
             configuration_url=f"https://{device_info.ip}",
         )
 
-        return device, device_info
-
     async def async_step_remove_device(self, user_input=None):
         choices, device_by_id = await self.get_device_choices()
         if not choices:
@@ -213,9 +290,10 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             device_id = user_input["device"]
             await self.remove_device_by_id(device_id)
-            self.reload()
+            devices = dict(self.config_entry.options)
+            devices.pop(device_id, None)
 
-            return self.async_create_entry(title="", data={})
+            return self.async_create_entry(title="", data=devices)
 
         return self.async_show_form(
             step_id="remove_device",
@@ -238,10 +316,7 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
             raise ValueError(f"Device with ID {device_id} not found")
 
         # Find all entities linked to this device
-        linked_entities = [
-            entry for entry in entity_registry.entities.values()
-            if entry.device_id == device_id
-        ]
+        linked_entities = er.async_entries_for_device(entity_registry, device_id, include_disabled_entities=True)
 
         # Remove all entities first
         for entity in linked_entities:
@@ -292,8 +367,6 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
                     **device_info.to_dict(),
                 }
 
-            self.reload()
-
             return self.async_create_entry(title="", data=current_devices)
 
         return self.async_show_form(
@@ -306,10 +379,14 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_edit_settings(self, user_input=None):
         if user_input is not None:
-            # Save the updated options
+            # Save the updated options; device options are kept, the settings change reloads the entry.
             return self.async_create_entry(
                 title="",
-                data={"subnet": user_input["subnet"], "enable_mac_discovery": user_input["enable_mac_discovery"]},
+                data={
+                    **self.config_entry.options,
+                    "subnet": user_input["subnet"],
+                    "enable_mac_discovery": user_input["enable_mac_discovery"],
+                },
             )
 
         return self.async_show_form(
@@ -328,13 +405,8 @@ class DeviceOptionsFlowHandler(config_entries.OptionsFlow):
 
             # Also remove devices from the device registry
             device_registry = dr.async_get(self.hass)
-            for device_id in list(device_registry.devices):
-                device = device_registry.devices[device_id]
-                if self.config_entry.entry_id in device.config_entries:
-                    device_registry.async_remove_device(device.id)
-
-            # Reload the config entry to apply changes
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+            for device in dr.async_entries_for_config_entry(device_registry, self.config_entry.entry_id):
+                device_registry.async_remove_device(device.id)
 
             return self.async_create_entry(title="", data={})
 
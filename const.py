@@ -1,4 +1,35 @@
 from homeassistant.const import Platform
 
 DOMAIN = "ls_somfy_covers"
-PLATFORMS = [Platform.COVER, Platform.SENSOR]
\ No newline at end of file
+PLATFORMS = [Platform.COVER, Platform.SENSOR]
+
+# Seconds between coordinator polls of every shade in an entry.
+UPDATE_INTERVAL = 120
+
+# Seconds between status polls of a shade that is moving.
+MOTION_POLL_INTERVAL = 0.75
+# Seconds between estimated position updates while a shade is moving.
+MOTION_FRAME_INTERVAL = 0.25
+# Keep fast polling at least this long after a command, while the shade spins up.
+MOTION_START_GRACE = 2.0
+# Give up fast polling after this many seconds; the coordinator tick takes over.
+MOTION_MAX_DURATION = 120
+
+# Seconds a discovered device stays in the discovery cache without being seen again.
+DISCOVERY_DEVICE_TTL = 7 * 24 * 3600
+# Seconds after a full sweep during which rediscovery only re-verifies cached devices.
+DISCOVERY_SWEEP_TTL = 24 * 3600
+
+# Seconds to collect covers being added before reading their first status in one batch.
+RECONCILE_DELAY = 1.0
+# Covers restored from the last run are reconciled at most this many at a time,
+# spread over this many seconds, so a restart does not hit every controller at once.
+RECONCILE_CONCURRENCY = 4
+RECONCILE_STAGGER = 0.5
+RECONCILE_SPREAD = 60
+
+# Dispatched with (added, removed, changed) device ids when an entry's device options change.
+SIGNAL_DEVICES_UPDATED = f"{DOMAIN}_devices_updated_{{}}"
+
+# Seconds over which a cover's state changes are merged into a single write.
+STATE_FRAME_INTERVAL = 0.1
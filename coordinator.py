@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Callable, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import (
+    DOMAIN,
+    UPDATE_INTERVAL,
+    RECONCILE_DELAY,
+    RECONCILE_CONCURRENCY,
+    RECONCILE_STAGGER,
+    RECONCILE_SPREAD,
+)
+from .somfy.classes.AsyncSomfyPoeBlindClient import AsyncSomfyPoeBlindClient
+from .somfy.classes.StatusPoller import StatusPoller
+from .somfy.dtos.somfy_objects import Status
+
+logger = logging.getLogger("Coordinator")
+
+
+class SomfyCoordinator(DataUpdateCoordinator):
+    """Polls every shade of a config entry from a single timer.
+
+    Data maps device id -> Status from the latest tick, or None when that
+    shade did not answer. Status listeners get each shade's answer as soon as
+    it arrives; the whole batch is published once the slowest shade is done.
+
+    New covers ask for a first status through request_reconcile. Covers with
+    no state to show are read right away; covers restored from the last run
+    are read slowly in the background. Reconciled statuses go only to their
+    own cover's listener.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+        super().__init__(
+            hass,
+            logger,
+            name=f"{DOMAIN} {entry.title}",
+            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+        )
+        self.clients: dict[str, AsyncSomfyPoeBlindClient] = {}
+        self.status_listeners: dict[str, Callable[[Optional[Status]], None]] = {}
+        self.poller = StatusPoller()
+        self.reconcile_poller = StatusPoller(RECONCILE_CONCURRENCY, RECONCILE_STAGGER, RECONCILE_SPREAD)
+        self.entry = entry
+        self._reconcile_urgent: set[str] = set()
+        self._reconcile_restored: set[str] = set()
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    def add_client(
+        self, device_id: str, client: AsyncSomfyPoeBlindClient,
+        on_status: Optional[Callable[[Optional[Status]], None]] = None
+    ):
+        self.clients[device_id] = client
+        if on_status is not None:
+            self.status_listeners[device_id] = on_status
+
+    def remove_client(self, device_id: str):
+        self.clients.pop(device_id, None)
+        self.status_listeners.pop(device_id, None)
+
+    @callback
+    def request_reconcile(self, device_id: str, restored: bool):
+        (self._reconcile_restored if restored else self._reconcile_urgent).add(device_id)
+        if self._reconcile_task is None:
+            self._reconcile_task = self.entry.async_create_background_task(
+                self.hass, self._async_reconcile(), f"{DOMAIN} reconcile {self.entry.title}"
+            )
+
+    async def _async_reconcile(self):
+        # Covers of one entry are added in a burst; read them as one batch.
+        await asyncio.sleep(RECONCILE_DELAY)
+        self._reconcile_task = None
+        urgent, self._reconcile_urgent = self._reconcile_urgent, set()
+        restored, self._reconcile_restored = self._reconcile_restored, set()
+        logger.info("Reconciling %s covers, %s of them restored", len(urgent) + len(restored), len(restored))
+
+        # Each answer goes only to its own cover. Broadcasting the merged map would hand every other
+        # cover its status from the last tick, older than what motion polling has applied since,
+        # and would push back the next refresh.
+        results = await asyncio.gather(
+            self.poller.poll(self._clients_for(urgent), on_result=self._async_handle_status),
+            self.reconcile_poller.poll(self._clients_for(restored), on_result=self._async_handle_status),
+        )
+        if self.data is not None:
+            for statuses in results:
+                self.data.update({device_id: status for device_id, status in statuses.items() if status is not None})
+
+    def _clients_for(self, device_ids) -> dict[str, AsyncSomfyPoeBlindClient]:
+        return {device_id: self.clients[device_id] for device_id in device_ids if device_id in self.clients}
+
+    @callback
+    def _async_handle_status(self, device_id: str, status: Optional[Status]):
+        listener = self.status_listeners.get(device_id)
+        if listener is not None:
+            listener(status)
+
+    async def _async_update_data(self):
+        logger.info("Refreshing %s covers", len(self.clients))
+        return await self.poller.poll(self.clients, on_result=self._async_handle_status)
@@ -1,13 +1,31 @@
+import asyncio
 import logging
-from datetime import timedelta
+import time
 from homeassistant.components.cover import CoverEntity, CoverEntityFeature
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_time_interval
-from .const import DOMAIN, PLATFORMS
-
-from .somfy.classes.SomfyPoeBlindClient import SomfyPoeBlindClient
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.restore_state import RestoreEntity, RestoredExtraData
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import (
+    DOMAIN,
+    MOTION_POLL_INTERVAL,
+    MOTION_FRAME_INTERVAL,
+    MOTION_START_GRACE,
+    MOTION_MAX_DURATION,
+    SIGNAL_DEVICES_UPDATED,
+)
+
+from .coordinator import SomfyCoordinator
+from .ip_tracking import ADDRESS_ERRORS, async_cancel_ip_tracking, async_track_ip_change
+from .metrics import get_device_metrics
+from .somfy.classes.AsyncSomfyPoeBlindClient import AsyncSomfyPoeBlindClient
+from .somfy.classes.CommandQueue import CommandQueue, DEFAULT_COMMAND_SPACING
+from .somfy.classes.FailureChannel import FailureChannel
+from .somfy.classes.MotionTracker import MotionTracker
 from .somfy.dtos.somfy_objects import Direction
+from .state_publisher import StatePublisher
 from .helpers.devices import get_devices_for_entry, get_device_options, build_device_info
 
 logger = logging.getLogger("Cover")
@@ -15,67 +33,92 @@ logger = logging.getLogger("Cover")
 async def async_setup_entry(hass, entry, async_add_entities):
     devices = await get_devices_for_entry(hass, entry)
     logger.info(f"Found {len(devices)} devices")
-    for device in devices:
-        await _load_device(hass, entry, device, async_add_entities)
-
-    return True
-
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    # Attempt to unload platforms (e.g., cover)
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-
-    if unload_ok:
-        # Cancel periodic task if it was registered
-        task_removers = hass.data[DOMAIN][entry.entry_id].get("task_removers")
-        logger.info(f"Removing {len(task_removers)} tasks.")
-        for task_remover in task_removers:
-            task_remover() # This cancels the timer
-
-        # Clean up stored data
-        # hass.data[DOMAIN].pop(entry.entry_id, None)
+    coordinator = SomfyCoordinator(hass, entry)
+    hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {})
+    hass.data[DOMAIN][entry.entry_id]["coordinator"] = coordinator
+
+    entities = [
+        cover_entity for cover_entity in (_load_device(hass, entry, coordinator, device) for device in devices)
+        if cover_entity is not None
+    ]
+    # Setup never waits on a shade: covers restore their last state and the coordinator
+    # reads the controllers in the background, each cover becoming available as its shade answers.
+    async_add_entities(entities)
+
+    async def async_update_devices(added, removed, changed):
+        """Create, dispose or rebind only the covers whose options changed."""
+        covers = hass.data[DOMAIN][entry.entry_id].setdefault("covers", {})
+        for device_id in removed | changed:
+            cover_entity = covers.get(device_id)
+            if cover_entity is None:
+                continue
+
+            device_options = get_device_options(entry, device_id)
+            if device_options and device_options.get("pin"):
+                cover_entity.rebind(device_options)
+                continue
+
+            covers.pop(device_id, None)
+            await cover_entity.async_remove(force_remove=True)
+
+        device_registry = dr.async_get(hass)
+        new_entities = []
+        for device_id in added | changed:
+            device = device_registry.async_get(device_id)
+            if device_id in covers or device is None:
+                continue
+
+            cover_entity = _load_device(hass, entry, coordinator, device)
+            if cover_entity is not None:
+                new_entities.append(cover_entity)
+        async_add_entities(new_entities)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICES_UPDATED.format(entry.entry_id), async_update_devices)
+    )
 
-    return unload_ok
+    return True
 
 
-async def _load_device(hass, entry, device, async_add_entities):
-    entry_id = entry.entry_id
+def _load_device(hass, entry, coordinator, device):
     device_options = get_device_options(entry, device.id)
 
     if not device_options:
         logger.info(f"{device.identifiers} has no options")
-        return
+        return None
 
     if not device_options.get("pin"):
         logger.info(f"{device.identifiers} pin not set.")
-        return
+        return None
 
     logger.info(f"{device.identifiers} has options: {device_options}")
     async def on_failure(e):
-        logger.error('Somfy callback error: %s', e)
-        await hass.async_create_task(
-            hass.config_entries.async_reload(entry_id)
-        )
-
-    client = SomfyPoeBlindClient.init_with_device(device_options, on_failure)
-    cover_entity = SomfyCover(device, device_options, client)
-
-    await hass.async_add_executor_job(client.login)
+        logger.error('Somfy callback error (%s): %s', type(e).__name__, e)
+        # A shade moved by DHCP only needs its own address updated.
+        if isinstance(e, ADDRESS_ERRORS) and await async_track_ip_change(hass, entry, device.id, cover_entity):
+            client.breaker.reset()
+            return
 
-    hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {})
-    async_add_entities([cover_entity])
+        # Recover this shade alone; the rest of the entry keeps running.
+        cover_entity.schedule_reconnect()
 
-    async def periodic_refresh(now):
-        logger.info("Refreshing cover for device: %s - %s", client.ip, device.id)
-        await hass.async_add_executor_job(client.login)
-        await cover_entity.async_update()
+    # Failures are handled in their own task so recovery never blocks the command that failed.
+    failure_channel = FailureChannel(on_failure)
+    client = AsyncSomfyPoeBlindClient.init_with_device(
+        device_options, failure_channel, metrics=get_device_metrics(hass, entry.entry_id, device.id)
+    )
+    command_queue = CommandQueue(client, device_options.get("command_spacing", DEFAULT_COMMAND_SPACING))
+    cover_entity = SomfyCover(coordinator, device, device_options, client, command_queue, failure_channel)
+    coordinator.add_client(device.id, client, cover_entity.handle_status)
 
-    # ⏱ Set interval to 2 minutes
-    task_remover = async_track_time_interval(hass, periodic_refresh, timedelta(minutes=2))
-    hass.data[DOMAIN][entry.entry_id].setdefault("task_removers", []).append(task_remover)
+    hass.data[DOMAIN][entry.entry_id].setdefault("covers", {})[device.id] = cover_entity
+    return cover_entity
 
 
-class SomfyCover(CoverEntity):
+class SomfyCover(CoordinatorEntity, RestoreEntity, CoverEntity):
+    # The address never changes between writes and the rest repeats the state; keep them out of history.
+    _unrecorded_attributes = frozenset({"ip", "position_raw", "is_opening", "is_closing"})
     supported_features = (
         CoverEntityFeature.OPEN |
         CoverEntityFeature.CLOSE |
@@ -83,9 +126,12 @@ class SomfyCover(CoverEntity):
         CoverEntityFeature.SET_POSITION
     )
 
-    def __init__(self, device, data, client):
+    def __init__(self, coordinator, device, data, client, command_queue, failure_channel):
+        super().__init__(coordinator)
         self.device = device
         self._client = client
+        self._command_queue = command_queue
+        self._failure_channel = failure_channel
         self._name = data["name"]
         self._ip = data["ip"]
         self._pin = data["pin"]
@@ -93,11 +139,57 @@ class SomfyCover(CoverEntity):
         self._position = None
         self._is_closing = None
         self._is_opening = None
+        # Last status applied; None until the shade has answered once.
+        self._status = None
+        # Wall-clock time of the last status, kept across restarts.
+        self._updated_at = None
+        self._restored = False
+        self._tracker = MotionTracker()
+        self._motion_task = None
+        self._reconnect_remover = None
+        self._publisher = StatePublisher(self, self._state_snapshot)
+
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def command_queue(self):
+        return self._command_queue
 
     @property
     def device_info(self):
         return build_device_info(self.device, self._ip)
+
+    def rebind(self, data: dict):
+        """Apply edited options to this cover; only its own client logs in again."""
+        self._name = data.get("name", self._name)
+        if data["ip"] == self._ip and data["pin"] == self._pin:
+            return
+
+        logger.info("%s rebinding to %s", self._ip, data["ip"])
+        self._ip = data["ip"]
+        self._pin = data["pin"]
+        self._client.rebind(self._ip, self._pin)
+        self.coordinator.request_reconcile(self.device.id, restored=False)
+        self._publisher.publish()
+
+    def update_ip(self, ip: str):
+        """Point this cover and its client at a new address; the login is redone lazily."""
+        self._ip = ip
+        self._client.ip = ip
+        self._publisher.publish()
     
+    def _state_snapshot(self):
+        return (
+            self.available,
+            self.current_cover_position,
+            self._position,
+            self._is_opening,
+            self._is_closing,
+            self._ip,
+        )
+
     @property
     def extra_state_attributes(self):
         """Return additional info about the cover."""
@@ -110,11 +202,24 @@ class SomfyCover(CoverEntity):
 
     @property
     def available(self) -> bool:
-        return True
+        return (self._status is not None or self._restored) and self._client.breaker.available
+
+    @property
+    def extra_restore_state_data(self) -> RestoredExtraData:
+        return RestoredExtraData({
+            "position": self._position,
+            "direction": 1 if self._is_opening else -1 if self._is_closing else 0,
+            "updated_at": self._updated_at,
+        })
 
     @property
     def current_cover_position(self):
         """Return the current position of the cover."""
+        if self._motion_task is not None and self._tracker.direction:
+            estimate = self._tracker.estimate()
+            if estimate is not None:
+                return round(estimate)
+
         return self._position
 
     @property
@@ -132,38 +237,182 @@ class SomfyCover(CoverEntity):
         """Return if the cover is opening or not."""
         return self._is_opening
 
+    def apply_command(self, command: str, params: dict):
+        """Record a command the controller was sent, including one sent outside the entity, e.g. by a group command.
+
+        Pass the command that was actually sent: a queued command may have been merged into a later one.
+        """
+        if command == "move.up":
+            self.set_motion(True, False, 100)
+        elif command == "move.down":
+            self.set_motion(False, True, 0)
+        elif command == "move.stop":
+            self.set_motion(False, False)
+        elif command == "move.to":
+            self.set_target_position(100 - params["position"])
+
+    def set_motion(self, is_opening: bool, is_closing: bool, target: int = None):
+        """Record a motion command."""
+        self._is_opening = is_opening
+        self._is_closing = is_closing
+        direction = 1 if is_opening else -1 if is_closing else 0
+        self._tracker.start(direction, target)
+        self._start_motion_tracking()
+        self._publisher.publish()
+
+    def set_target_position(self, position: int):
+        """Record a move.to command for the given position."""
+        current = self._position
+        if current is None or current == position:
+            self._start_motion_tracking()
+            return
+
+        self.set_motion(position > current, position < current, position)
+
+    def _start_motion_tracking(self):
+        if self._motion_task is None and self.hass is not None:
+            self._motion_task = self.hass.async_create_task(self._track_motion())
+
+    async def _track_motion(self):
+        """Poll quickly while the shade moves, estimating the position between polls."""
+        started = time.monotonic()
+        next_poll = started
+        try:
+            while time.monotonic() - started < MOTION_MAX_DURATION:
+                now = time.monotonic()
+                if now >= next_poll:
+                    status = await self._client.get_status()
+                    next_poll = time.monotonic() + MOTION_POLL_INTERVAL
+                    if status is None:
+                        break
+
+                    moving = self._apply_status(status) and status.is_moving()
+                    if not moving and now - started >= MOTION_START_GRACE:
+                        break
+
+                self._publisher.publish()
+                await asyncio.sleep(MOTION_FRAME_INTERVAL)
+        finally:
+            self._motion_task = None
+
+        self._publisher.publish()
+
     async def async_open_cover(self, **kwargs):
-        await self.hass.async_add_executor_job(self._client.up)
-        self._is_closing = False
-        self._is_opening = True
-        self.async_write_ha_state()
+        sent = await self._command_queue.up()
+        self.apply_command(sent.command, sent.params)
 
     async def async_close_cover(self, **kwargs):
-        await self.hass.async_add_executor_job(self._client.down)
-        self._is_closing = True
-        self._is_opening = False
-        self.async_write_ha_state()
+        sent = await self._command_queue.down()
+        self.apply_command(sent.command, sent.params)
 
     async def async_stop_cover(self, **kwargs):
-        await self.hass.async_add_executor_job(self._client.stop)
-        self._is_closing = False
+        sent = await self._command_queue.stop()
+        self.apply_command(sent.command, sent.params)
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        restored = await self._async_restore()
+        if not self._apply_status():
+            self.coordinator.request_reconcile(self.device.id, restored)
+
+    async def _async_restore(self) -> bool:
+        """Show the state saved at shutdown until the shade is read again.
+
+        Returns True when that state can be trusted for a while, so the shade
+        can be reconciled at a slow pace.
+        """
+        extra_data = await self.async_get_last_extra_data()
+        data = extra_data.as_dict() if extra_data is not None else {}
+        if data.get("position") is None:
+            return False
+
+        self._position = data["position"]
+        self._updated_at = data.get("updated_at")
         self._is_opening = False
-        self.async_write_ha_state()
+        self._is_closing = False
+        self._restored = True
+        self._tracker.update(self._position, 0)
+        # A shade that was moving at shutdown has since stopped somewhere else.
+        return not data.get("direction")
+
+    @callback
+    def schedule_reconnect(self):
+        """After a failure, retry this shade once its circuit breaker backoff has elapsed."""
+        if self.hass is None:
+            return
 
-    async def async_update(self):
-        # await self.hass.async_add_executor_job(self._client.login)
-        logger.debug("update triggered: %s:%s", self._is_closing, self._is_opening)
-        if self._is_closing is False and self._is_opening is False:
+        self._publisher.publish()
+        if self._reconnect_remover is not None or self._client.breaker.available:
             return
 
-        status = await self.hass.async_add_executor_job(self._client.get_status)
+        delay = self._client.breaker.seconds_until_retry()
+        logger.info("%s unavailable, reconnecting in %.0fs", self._ip, delay)
+        self._reconnect_remover = async_call_later(self.hass, delay, self._async_reconnect)
+
+    async def _async_reconnect(self, _now):
+        self._reconnect_remover = None
+        status = await self._client.get_status()
+        if status is not None:
+            logger.info("%s reconnected", self._ip)
+            self._apply_status(status)
+        self._publisher.publish()
+
+    async def async_will_remove_from_hass(self):
+        await super().async_will_remove_from_hass()
+        self._publisher.cancel()
+        if self._reconnect_remover is not None:
+            self._reconnect_remover()
+        if self._motion_task is not None:
+            self._motion_task.cancel()
+        self._command_queue.cancel()
+        # Recovery still running for this shade, e.g. an IP re-resolution, must not outlive it.
+        self._failure_channel.cancel()
+        async_cancel_ip_tracking(self.hass, self.coordinator.entry, self.device.id)
+        self.coordinator.remove_client(self.device.id)
+
+    def _apply_status(self, status=None) -> bool:
+        if status is None:
+            status = (self.coordinator.data or {}).get(self.device.id)
         logger.debug(f"Shade status - {status}")
-        if status is not None and status.error is None:
-            # This is basic. You can refine it based on actual status/direction data
-            self._position = 100 - status.position.value
-            self._is_closing = status.is_moving() and status.get_direction() == Direction.down
-            self._is_opening = status.is_moving() and status.get_direction() == Direction.up
-            self.async_write_ha_state()
+        if status is None or status.error is not None:
+            return False
+
+        self._status = status
+        self._updated_at = time.time()
+        # This is basic. You can refine it based on actual status/direction data
+        self._position = 100 - status.position.value
+        self._is_closing = status.is_moving() and status.get_direction() == Direction.down
+        self._is_opening = status.is_moving() and status.get_direction() == Direction.up
+        self._tracker.update(self._position, 1 if self._is_opening else -1 if self._is_closing else 0)
+        return True
+
+    @callback
+    def handle_status(self, status):
+        """Apply this shade's answer as soon as it arrives, ahead of the rest of the batch."""
+        if self.hass is None or status is None or self._motion_task is not None:
+            return
+
+        self._publish_status(status)
+
+    @callback
+    def _handle_coordinator_update(self):
+        if self._motion_task is not None:
+            # The fast motion poll is already reporting this shade.
+            return
+
+        status = (self.coordinator.data or {}).get(self.device.id)
+        if status is not None and status is self._status:
+            # Already applied when the shade answered.
+            return
+
+        self._publish_status(status)
+
+    def _publish_status(self, status):
+        if self._apply_status(status):
+            if self._is_opening or self._is_closing:
+                # Moved from a wall switch or remote; follow it until it stops.
+                self._start_motion_tracking()
+            self._publisher.publish()
         else:
             logger.warning("Unable to retrieve shade status")
 
@@ -171,4 +420,5 @@ class SomfyCover(CoverEntity):
         """Move the cover to a specific position."""
         logger.debug(f"setting position {kwargs}")
         position = kwargs.get("position")
-        await self.hass.async_add_executor_job(self._client.move, 100 - position)
\ No newline at end of file
+        sent = await self._command_queue.move(100 - position)
+        self.apply_command(sent.command, sent.params)
\ No newline at end of file
@@ -0,0 +1,57 @@
+import logging
+import time
+from typing import Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, DISCOVERY_DEVICE_TTL, DISCOVERY_SWEEP_TTL
+
+logger = logging.getLogger("Discovery Cache")
+
+STORAGE_VERSION = 1
+
+
+class DiscoveryCache:
+    """Devices seen by discovery, persisted per config entry.
+
+    Devices are keyed by MAC and carry ip, last_seen and firmware. Sweeps
+    record when each subnet was last fully scanned.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.discovery.{entry_id}")
+        self.devices: dict[str, dict] = {}
+        self.sweeps: dict[str, float] = {}
+
+    async def async_load(self):
+        data = await self._store.async_load() or {}
+        now = time.time()
+        self.devices = {
+            mac: device for mac, device in data.get("devices", {}).items()
+            if now - device.get("last_seen", 0) < DISCOVERY_DEVICE_TTL
+        }
+        self.sweeps = data.get("sweeps", {})
+        logger.info("Loaded %s cached devices", len(self.devices))
+
+    async def async_save(self):
+        await self._store.async_save({"devices": self.devices, "sweeps": self.sweeps})
+
+    def seen(self, ip: str, mac: str, firmware: Optional[str] = None):
+        device = self.devices.setdefault(mac, {"mac": mac})
+        device["ip"] = ip
+        device["last_seen"] = time.time()
+        if firmware is not None:
+            device["firmware"] = firmware
+
+    def forget(self, mac: str):
+        self.devices.pop(mac, None)
+
+    def known_ips(self) -> dict[str, str]:
+        return {device["ip"]: mac for mac, device in self.devices.items() if device.get("ip")}
+
+    def needs_sweep(self, subnet: str) -> bool:
+        return time.time() - self.sweeps.get(subnet, 0) >= DISCOVERY_SWEEP_TTL
+
+    def mark_swept(self, subnet: str):
+        self.sweeps[subnet] = time.time()
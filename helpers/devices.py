@@ -1,26 +1,133 @@
-from homeassistant.helpers.device_registry import async_get as get_device_registry, DeviceInfo
+from typing import Optional
 
+from homeassistant.core import callback, Event
+from homeassistant.helpers.device_registry import (
+    async_get as get_device_registry,
+    async_entries_for_config_entry,
+    DeviceEntry,
+    DeviceInfo,
+    EVENT_DEVICE_REGISTRY_UPDATED,
+)
 
-async def get_devices_for_entry(hass, config_entry):
-    device_registry = get_device_registry(hass)
+from ..const import DOMAIN
+
+DEVICE_INDEX_KEY = f"{DOMAIN}_device_index"
+
+
+class DeviceIndex:
+    """MAC and name lookups over this integration's devices.
+
+    Built once from the registry's per-entry index and kept current from
+    device registry events, so lookups never walk the whole registry. MACs
+    are keyed per config entry: the same shade may be known to another entry.
+    """
+
+    def __init__(self, hass):
+        self._registry = get_device_registry(hass)
+        self.by_mac: dict[tuple[str, str], str] = {}
+        self.by_name: dict[str, str] = {}
+        self._keys: dict[str, tuple[list[tuple[str, str]], Optional[str]]] = {}
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            for device in async_entries_for_config_entry(self._registry, entry.entry_id):
+                self._add(device)
+        self._unsubscribe = hass.bus.async_listen(EVENT_DEVICE_REGISTRY_UPDATED, self._async_handle_event)
+
+    @staticmethod
+    def get_mac(device: DeviceEntry) -> Optional[str]:
+        for domain, identifier in device.identifiers:
+            if domain == DOMAIN:
+                return identifier.upper()
+
+        return None
+
+    def _add(self, device: DeviceEntry):
+        mac = self.get_mac(device)
+        if mac is None:
+            return
+
+        mac_keys = [(entry_id, mac) for entry_id in device.config_entries]
+        self._keys[device.id] = (mac_keys, device.name)
+        for key in mac_keys:
+            self.by_mac[key] = device.id
+        if device.name:
+            self.by_name[device.name] = device.id
+
+    def _remove(self, device_id: str):
+        mac_keys, name = self._keys.pop(device_id, ([], None))
+        for key in mac_keys:
+            if self.by_mac.get(key) == device_id:
+                del self.by_mac[key]
+        if name is not None and self.by_name.get(name) == device_id:
+            del self.by_name[name]
+
+    @callback
+    def _async_handle_event(self, event: Event):
+        device_id = event.data.get("device_id")
+        self._remove(device_id)
+        if event.data.get("action") != "remove":
+            device = self._registry.async_get(device_id)
+            if device is not None:
+                self._add(device)
 
-    return [
-        device for device in device_registry.devices.values()
-        if config_entry.entry_id in device.config_entries
-    ]
+    def get_by_mac(self, entry_id: str, mac: str) -> Optional[DeviceEntry]:
+        device_id = self.by_mac.get((entry_id, mac.upper()))
+        return self._registry.async_get(device_id) if device_id else None
+
+    def get_by_name(self, name: str) -> Optional[DeviceEntry]:
+        device_id = self.by_name.get(name)
+        return self._registry.async_get(device_id) if device_id else None
+
+    def close(self):
+        self._unsubscribe()
+
+
+def get_device_index(hass) -> DeviceIndex:
+    if DEVICE_INDEX_KEY not in hass.data:
+        hass.data[DEVICE_INDEX_KEY] = DeviceIndex(hass)
+
+    return hass.data[DEVICE_INDEX_KEY]
+
+def close_device_index(hass):
+    index = hass.data.pop(DEVICE_INDEX_KEY, None)
+    if index is not None:
+        index.close()
+
+async def get_devices_for_entry(hass, config_entry):
+    return async_entries_for_config_entry(get_device_registry(hass), config_entry.entry_id)
 
 def get_device_by_name(hass, name: str):
-    device_registry = get_device_registry(hass)
+    """Find one of this integration's devices by name."""
+    return get_device_index(hass).get_by_name(name)
+
+def get_device_by_mac(hass, config_entry, mac: str):
+    """Find a device of this config entry by MAC."""
+    return get_device_index(hass).get_by_mac(config_entry.entry_id, mac)
 
-    for device in device_registry.devices.values():
-        if device.name == name:
-            return device
+def get_or_create_draft_device(hass, config_entry, ip, mac):
+    device_registry = get_device_registry(hass)
+    # Rediscovering a known device must not rename it back to a draft, whatever case its MAC was reported in.
+    # Only this entry's devices qualify; another entry may know the same shade, e.g. on an overlapping subnet.
+    device = get_device_by_mac(hass, config_entry, mac)
+    if device is not None:
+        return device
 
-    return None  # Not found
+    return device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={(config_entry.domain, mac)},
+        name=f"Draft {ip} - {mac}",
+        manufacturer="Somfy",
+        configuration_url=f"https://{ip}",
+    )
 
 def get_device_options(config_entry, device_id):
     return config_entry.options.get(device_id)
 
+def split_options(options) -> tuple[dict, dict]:
+    """Split entry options into per-device options (keyed by device id) and entry settings."""
+    devices = {key: value for key, value in options.items() if isinstance(value, dict)}
+    settings = {key: value for key, value in options.items() if not isinstance(value, dict)}
+    return devices, settings
+
 def build_device_info(device, ip = None):
     configuration_url = None
     if ip:
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+from .discovery_cache import DiscoveryCache
+from .passive_discovery import get_passive_discovery
+from .somfy.classes.NeighborTable import NeighborTable
+from .somfy.classes.PassiveDiscovery import PassiveDiscovery
+from .somfy.classes.Scanner import Scanner, SOMFY_MAC_PREFIXES
+from .somfy.errors import SomfyConnectionError, SomfyTimeoutError
+
+logger = logging.getLogger("IP Tracking")
+
+# Errors that suggest the controller is no longer at its configured address.
+ADDRESS_ERRORS = (SomfyConnectionError, SomfyTimeoutError)
+
+
+async def async_resolve_device_ip(hass: HomeAssistant, entry: ConfigEntry, mac: str, current_ip: str) -> Optional[str]:
+    """Find where a shade moved to from what is already known about its MAC.
+
+    Candidates come from the kernel neighbor table, passive discovery and the
+    discovery cache; only those candidates are probed, never the whole subnet.
+    """
+    mac = PassiveDiscovery.normalize_mac(mac)
+    candidates = []
+
+    neighbor_table = NeighborTable(SOMFY_MAC_PREFIXES)
+    if await neighbor_table.refresh():
+        candidates.append(neighbor_table.find_ip(mac))
+
+    passive = get_passive_discovery(hass, entry.entry_id)
+    if passive is not None:
+        candidates.append(passive.devices.get(mac))
+
+    cache = DiscoveryCache(hass, entry.entry_id)
+    await cache.async_load()
+    candidates.extend(
+        device.get("ip") for cached_mac, device in cache.devices.items()
+        if PassiveDiscovery.normalize_mac(cached_mac) == mac
+    )
+
+    candidates = {ip: mac for ip in candidates if ip and ip != current_ip}
+    if not candidates:
+        return None
+
+    async with Scanner(entry.data["subnet"], use_mac_mock=not entry.data.get("enable_mac_discovery", True)) as scanner:
+        async for (ip, _) in scanner.verify_devices(candidates):
+            return ip
+
+    return None
+
+
+async def async_track_ip_change(hass: HomeAssistant, entry: ConfigEntry, device_id: str, cover) -> bool:
+    """Re-resolve a shade's IP by MAC and rebind only that shade. Returns True if it moved."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if entry_data is None:
+        # The entry was unloaded while the failure was being delivered.
+        return False
+
+    resolutions = entry_data.setdefault("ip_resolutions", {})
+    task = resolutions.get(device_id)
+    if task is None:
+        # Owned by the entry, so unloading it cancels the probe.
+        task = entry.async_create_background_task(
+            hass, _async_track_ip_change(hass, entry, device_id, cover), f"{DOMAIN} resolve ip {device_id}"
+        )
+        resolutions[device_id] = task
+        task.add_done_callback(lambda _: resolutions.pop(device_id, None))
+
+    return await asyncio.shield(task)
+
+
+@callback
+def async_cancel_ip_tracking(hass: HomeAssistant, entry: ConfigEntry, device_id: str):
+    """Stop re-resolving the IP of a shade that is being removed."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    task = entry_data.get("ip_resolutions", {}).get(device_id)
+    if task is not None:
+        task.cancel()
+
+
+async def _async_track_ip_change(hass, entry, device_id, cover) -> bool:
+    device_options = entry.options.get(device_id) or {}
+    mac = device_options.get("mac")
+    current_ip = device_options.get("ip")
+    if not mac:
+        return False
+
+    new_ip = await async_resolve_device_ip(hass, entry, mac, current_ip)
+    if new_ip is None:
+        logger.info(f"No new address found for {mac}")
+        return False
+
+    logger.info(f"Device {mac} moved from {current_ip} to {new_ip}")
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, device_id: {**device_options, "ip": new_ip}}
+    )
+    dr.async_get(hass).async_update_device(device_id, configuration_url=f"https://{new_ip}")
+    cover.update_ip(new_ip)
+    return True
@@ -0,0 +1,89 @@
+import logging
+import math
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .somfy.classes.ClientMetrics import ClientMetrics
+
+logger = logging.getLogger("Metrics")
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+METRICS_VIEW_KEY = f"{DOMAIN}_metrics_view"
+
+
+def get_device_metrics(hass: HomeAssistant, entry_id: str, device_id: str) -> ClientMetrics:
+    """Metrics of one shade, shared by its client and its diagnostic sensors."""
+    entry_metrics = hass.data[DOMAIN][entry_id].setdefault("metrics", {})
+    return entry_metrics.setdefault(device_id, ClientMetrics())
+
+
+def async_setup_metrics_view(hass: HomeAssistant):
+    # Views cannot be unregistered, so one view serves every entry for the lifetime of Home Assistant.
+    if hass.data.get(METRICS_VIEW_KEY):
+        return
+
+    hass.http.register_view(SomfyMetricsView())
+    hass.data[METRICS_VIEW_KEY] = True
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus(hass: HomeAssistant) -> str:
+    """All shades' metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP somfy_request_duration_seconds Latency of requests to a Somfy controller.",
+        "# TYPE somfy_request_duration_seconds histogram",
+    ]
+    errors = [
+        "# HELP somfy_request_errors_total Failed requests to a Somfy controller.",
+        "# TYPE somfy_request_errors_total counter",
+    ]
+    reconnects = [
+        "# HELP somfy_reconnects_total Re-logins and circuit breaker recoveries of a Somfy controller.",
+        "# TYPE somfy_reconnects_total counter",
+    ]
+
+    for config in hass.data.get(DOMAIN, {}).values():
+        covers = config.get("covers", {})
+        for device_id, metrics in config.get("metrics", {}).items():
+            cover = covers.get(device_id)
+            device = {
+                "device": cover.client.name if cover else device_id,
+                "ip": cover.client.ip if cover else "",
+            }
+
+            latency, error_counts, reconnect_count = metrics.snapshot()
+            for method, (buckets, total, count) in sorted(latency.items()):
+                for bound, bucket_count in buckets:
+                    le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                    lines.append(f"somfy_request_duration_seconds_bucket{_labels(**device, method=method, le=le)} {bucket_count}")
+                lines.append(f"somfy_request_duration_seconds_sum{_labels(**device, method=method)} {total:.6f}")
+                lines.append(f"somfy_request_duration_seconds_count{_labels(**device, method=method)} {count}")
+
+            for (method, error), count in sorted(error_counts.items()):
+                errors.append(f"somfy_request_errors_total{_labels(**device, method=method, error=error)} {count}")
+
+            reconnects.append(f"somfy_reconnects_total{_labels(**device)} {reconnect_count}")
+
+    return "\n".join(lines + errors + reconnects) + "\n"
+
+
+class SomfyMetricsView(HomeAssistantView):
+    """Prometheus endpoint; scrape with a long-lived access token."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        hass = request.app["hass"]
+        return web.Response(text=render_prometheus(hass), content_type="text/plain", charset="utf-8")
@@ -0,0 +1,50 @@
+import ipaddress
+import logging
+from typing import Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .helpers.devices import get_or_create_draft_device
+from .somfy.classes.PassiveDiscovery import PassiveDiscovery
+
+logger = logging.getLogger("Passive Discovery")
+
+
+def async_setup_passive_discovery(hass: HomeAssistant, entry: ConfigEntry) -> PassiveDiscovery:
+    """Start listening for shades on the entry's subnet and add new ones as drafts."""
+    passive = PassiveDiscovery(entry.data["subnet"])
+
+    @callback
+    def on_device(ip, mac):
+        device = get_or_create_draft_device(hass, entry, ip, mac)
+        if device.id in entry.options:
+            return
+
+        logger.info(f"Adding passively discovered device {mac} at {ip}")
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, device.id: {"ip": ip, "mac": mac}}
+        )
+
+    passive.add_listener(on_device)
+    passive.start()
+    return passive
+
+
+def get_passive_discovery(hass: HomeAssistant, entry_id: str) -> Optional[PassiveDiscovery]:
+    return hass.data.get(DOMAIN, {}).get(entry_id, {}).get("passive_discovery")
+
+
+def get_passive_discovery_for_ip(hass: HomeAssistant, ip: str) -> Optional[PassiveDiscovery]:
+    try:
+        address = ipaddress.IPv4Address(ip)
+    except ValueError:
+        return None
+
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        passive = entry_data.get("passive_discovery")
+        if passive is not None and address in passive.network:
+            return passive
+
+    return None
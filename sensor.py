@@ -1,10 +1,14 @@
 import logging
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_DEVICES_UPDATED
 from .helpers.devices import get_devices_for_entry, get_device_options, build_device_info
+from .metrics import get_device_metrics
 # from .somfy.classes.SomfyPoeBlindClient import SomfyPoeBlindClient
 
 logger = logging.getLogger("Sensor")
@@ -16,27 +20,80 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     config_entry.data.get("subnet")
     entities.append(ReadOnlyValueSensor("Subnet", config_entry.data.get("subnet")))
 
+    sensors = hass.data[DOMAIN][config_entry.entry_id].setdefault("sensors", {})
     for device in devices:
-        device_options = get_device_options(config_entry, device.id)
+        sensors[device.id] = _create_device_sensors(hass, config_entry, device)
+        entities.extend(sensors[device.id])
 
-        if not device_options:
-            logger.info(f"{device.identifiers} has no options")
-            continue
+    async_add_entities(entities)
 
-        logger.info(f"Creating sensors for {device.identifiers}")
-        # client = SomfyPoeBlindClient.init_with_device(device_options)
-        # await hass.async_add_executor_job(client.login)
-        # device_info = await hass.async_add_executor_job(client.get_info)
-        for key in device_options:
-            logger.info(f"{key}: {device_options[key]}")
-            entities.append(DeviceDetailsSensor(device, key, device_options[key]))
+    async def async_update_devices(added, removed, changed):
+        """Update the sensors of changed devices in place; rebuild only when their set changes."""
+        device_registry = dr.async_get(hass)
+        rebuild = set(removed)
+        for device_id in changed:
+            device = device_registry.async_get(device_id)
+            existing = {entity.unique_id: entity for entity in sensors.get(device_id, [])}
+            updated = _create_device_sensors(hass, config_entry, device) if device is not None else []
+            if not existing or existing.keys() != {entity.unique_id for entity in updated}:
+                # An option was added or dropped, or the PIN was set or cleared.
+                rebuild.add(device_id)
+                continue
 
-        is_available = device_options.get("pin") is not None
-        entities.append(DeviceDetailsSensor(device, "available", is_available, "mdi:check-network" if is_available else "mdi:close-network"))
+            # Same sensors, e.g. after an IP move: only their values change, with no gap in history.
+            for entity in updated:
+                if isinstance(entity, DeviceDetailsSensor):
+                    existing[entity.unique_id].set_value(entity.native_value, entity.icon)
 
-    async_add_entities(entities)
+        for device_id in rebuild:
+            for entity in sensors.pop(device_id, []):
+                await entity.async_remove()
+
+        new_entities = []
+        for device_id in added | (rebuild - removed):
+            device = device_registry.async_get(device_id)
+            if device is None:
+                continue
+
+            sensors[device_id] = _create_device_sensors(hass, config_entry, device)
+            new_entities.extend(sensors[device_id])
+        async_add_entities(new_entities)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICES_UPDATED.format(config_entry.entry_id), async_update_devices)
+    )
+
+def _create_device_sensors(hass, config_entry, device) -> list[SensorEntity]:
+    device_options = get_device_options(config_entry, device.id)
+
+    if not device_options:
+        logger.info(f"{device.identifiers} has no options")
+        return []
+
+    logger.info(f"Creating sensors for {device.identifiers}")
+    entities = []
+    # client = SomfyPoeBlindClient.init_with_device(device_options)
+    # await hass.async_add_executor_job(client.login)
+    # device_info = await hass.async_add_executor_job(client.get_info)
+    for key in device_options:
+        logger.info(f"{key}: {device_options[key]}")
+        entities.append(DeviceDetailsSensor(device, key, device_options[key]))
+
+    is_available = device_options.get("pin") is not None
+    entities.append(DeviceDetailsSensor(device, "available", is_available, "mdi:check-network" if is_available else "mdi:close-network"))
+
+    if is_available:
+        metrics = get_device_metrics(hass, config_entry.entry_id, device.id)
+        entities.extend(LatencySensor(device, metrics, q) for q in (50, 95, 99))
+        entities.append(CounterSensor(device, metrics, "errors", lambda m: m.error_count, "mdi:alert-circle-outline"))
+        entities.append(CounterSensor(device, metrics, "reconnects", lambda m: m.reconnects, "mdi:lan-connect"))
+
+    return entities
 
 class DeviceDetailsSensor(SensorEntity):
+    # The value is fixed at creation; polling would only rewrite the same state.
+    _attr_should_poll = False
+
     def __init__(self, device, label, value, icon = None):
         self._device = device
         self._attr_name = label
@@ -52,7 +109,67 @@ class DeviceDetailsSensor(SensorEntity):
     def native_value(self):
         return self._attr_native_value
 
+    def set_value(self, value, icon = None):
+        if value == self._attr_native_value and icon == self._attr_icon:
+            return
+
+        self._attr_native_value = value
+        self._attr_icon = icon
+        if self.hass is not None:
+            self.async_write_ha_state()
+
+class LatencySensor(SensorEntity):
+    """Recent request latency percentile of one shade, with a per-method breakdown."""
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+    # The per-method breakdown changes on every poll; keep it out of history.
+    _unrecorded_attributes = frozenset({"requests", "methods"})
+
+    def __init__(self, device, metrics, percentile):
+        self._device = device
+        self._metrics = metrics
+        self._percentile = percentile
+        self._attr_name = f"latency p{percentile}"
+        self._attr_unique_id = f"{device.id}_latency_p{percentile}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return build_device_info(self._device)
+
+    @property
+    def native_value(self):
+        value = self._metrics.percentile(self._percentile)
+        return round(value * 1000, 1) if value is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        return {"requests": self._metrics.request_count, "methods": self._metrics.summary()}
+
+class CounterSensor(SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, device, metrics, label, value_fn, icon = None):
+        self._device = device
+        self._metrics = metrics
+        self._value_fn = value_fn
+        self._attr_name = label
+        self._attr_unique_id = f"{device.id}_{label}"
+        self._attr_icon = icon
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return build_device_info(self._device)
+
+    @property
+    def native_value(self):
+        return self._value_fn(self._metrics)
+
 class ReadOnlyValueSensor(SensorEntity):
+    _attr_should_poll = False
+
     def __init__(self, label, value, icon = None):
         self._attr_name = label
         self._attr_unique_id = label
@@ -0,0 +1,79 @@
+import logging
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from .const import DOMAIN
+from .somfy.classes.ShadeGroup import ShadeGroup, DEFAULT_FAN_OUT
+
+logger = logging.getLogger("Services")
+
+SERVICE_GROUP_COMMAND = "group_command"
+
+# Service command -> ShadeGroup method
+GROUP_COMMANDS = {
+    "open": "up",
+    "close": "down",
+    "stop": "stop",
+    "set_position": "move",
+}
+
+GROUP_COMMAND_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Required("command"): vol.In(list(GROUP_COMMANDS)),
+        vol.Optional("position"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("max_concurrency", default=DEFAULT_FAN_OUT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+
+def _get_covers(hass: HomeAssistant, entity_ids: set[str]) -> list:
+    covers = []
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        for cover in entry_data.get("covers", {}).values():
+            if cover.entity_id in entity_ids:
+                covers.append(cover)
+
+    return covers
+
+
+async def async_setup_services(hass: HomeAssistant):
+    if hass.services.has_service(DOMAIN, SERVICE_GROUP_COMMAND):
+        return
+
+    async def group_command(call: ServiceCall) -> ServiceResponse:
+        command = call.data["command"]
+        covers = _get_covers(hass, await async_extract_entity_ids(hass, call))
+        if not covers:
+            return {"results": {}}
+
+        method = GROUP_COMMANDS[command]
+        # Go through each shade's queue so group commands coalesce with entity commands.
+        group = ShadeGroup([cover.command_queue for cover in covers], call.data["max_concurrency"])
+        if command == "set_position":
+            if "position" not in call.data:
+                raise HomeAssistantError("position is required for set_position")
+            results = await group.move(100 - call.data["position"])
+        else:
+            results = await getattr(group, method)()
+
+        for cover, result in zip(covers, results):
+            if result.success:
+                # A later command may have replaced this one in the shade's queue; record what was sent.
+                cover.apply_command(result.command, result.params)
+
+        return {
+            "results": {cover.entity_id: result.to_dict() for cover, result in zip(covers, results)}
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GROUP_COMMAND,
+        group_command,
+        schema=GROUP_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
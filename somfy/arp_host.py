@@ -0,0 +1,41 @@
+"""Run the ARP host endpoint the Docker deployment queries.
+
+    python -m somfy.arp_host --host 0.0.0.0 --port 5001
+    python -m somfy.arp_host --fixtures fixtures.json
+
+Fixtures are a JSON {ip: mac} mapping or a list of {"ip", "mac"} entries.
+"""
+import argparse
+import asyncio
+import json
+import logging
+
+from .classes.ArpHostServer import ArpHostServer, DEFAULT_ARP_HOST_PORT, DEFAULT_MAX_AGE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ARP lookups for Home Assistant running in Docker.")
+    parser.add_argument("--host", default="127.0.0.1", help="use 0.0.0.0 to serve the Docker bridge")
+    parser.add_argument("--port", type=int, default=DEFAULT_ARP_HOST_PORT)
+    parser.add_argument("--fixtures", help="JSON file to serve instead of the neighbor table")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as f:
+            fixtures = json.load(f)
+
+    async def run():
+        async with ArpHostServer(args.host, args.port, fixtures, args.max_age):
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+
+import aiohttp
+
+logger = logging.getLogger("ARP Host Client")
+
+
+class ArpHostClient:
+    """Keep-alive client for the host ARP endpoint used by the Docker deployment.
+
+    Lookups issued within `batch_window` seconds of each other are merged into
+    one `POST /arp` request. Hosts that only implement `GET /arp/<ip>` are
+    detected on the first batch and served one IP per request from then on.
+    `python -m somfy.arp_host` runs a compatible endpoint (ArpHostServer).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        limit: int = 8,
+        batch_size: int = 64,
+        batch_window: float = 0.05,
+        timeout: float = 2,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.limit = limit
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self.batch_supported = True
+        self._session = None
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._flush_handle = None
+        self._tasks = set()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+        return self._session
+
+    async def lookup(self, ip: str) -> str | None:
+        if not self.batch_supported:
+            return await self.lookup_one(ip)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(ip, []).append(future)
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: dict[str, list[asyncio.Future]]):
+        try:
+            macs = await self.lookup_many(list(batch))
+        except Exception as e:
+            logger.info("ARP batch lookup failed: %s", e)
+            macs = {}
+
+        for ip, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(macs.get(ip))
+
+    async def lookup_many(self, ips: list[str]) -> dict[str, str]:
+        """Resolve many IPs, in one round trip when the host supports it."""
+        if self.batch_supported:
+            url = f"{self.base_url}/arp"
+            try:
+                async with self._get_session().post(url, json={"ips": ips}) as resp:
+                    if resp.status in (404, 405):
+                        logger.info("ARP endpoint %s has no batch support", url)
+                        self.batch_supported = False
+                    elif resp.status != 200:
+                        logger.info("ARP endpoint %s returned HTTP %s", url, resp.status)
+                        return {}
+                    else:
+                        data = await resp.json(content_type=None)
+                        logger.debug(f"ARP endpoint {url} returned {data}")
+                        return self.parse_entries(data)
+            except Exception as e:
+                logger.info("ARP request failed %s: %s", url, e)
+                return {}
+
+        macs = await asyncio.gather(*(self.lookup_one(ip) for ip in ips))
+        return {ip: mac for ip, mac in zip(ips, macs) if mac}
+
+    async def lookup_one(self, ip: str) -> str | None:
+        url = f"{self.base_url}/arp/{ip}"
+        try:
+            async with self._get_session().get(url) as resp:
+                if resp.status != 200:
+                    logger.info("ARP endpoint %s returned HTTP %s", url, resp.status)
+                    return None
+
+                data = await resp.json(content_type=None)
+                logger.info(f"ARP endpoint {url} returned {data}")
+                if isinstance(data, list) and data:
+                    mac = data[0].get("mac")
+                    return mac.upper() if mac else None
+                return None
+        except Exception as e:
+            logger.info("ARP request failed %s: %s", url, e)
+            return None
+
+    @staticmethod
+    def parse_entries(data) -> dict[str, str]:
+        """Accept either a list of {"ip", "mac"} entries or an {ip: mac} mapping."""
+        if isinstance(data, dict):
+            items = data.items()
+        elif isinstance(data, list):
+            items = [(entry.get("ip"), entry.get("mac")) for entry in data if isinstance(entry, dict)]
+        else:
+            return {}
+
+        return {ip: mac.upper() for ip, mac in items if ip and mac}
+
+    async def close(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        for futures in self._pending.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(None)
+        self._pending = {}
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
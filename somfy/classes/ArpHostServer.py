@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from aiohttp import web
+
+from .ArpHostClient import ArpHostClient
+from .NeighborTable import NeighborTable
+
+logger = logging.getLogger("ARP Host Server")
+
+DEFAULT_ARP_HOST_PORT = 5001
+# Seconds a neighbor table dump is reused before the kernel is asked again.
+DEFAULT_MAX_AGE = 2.0
+
+
+class ArpHostServer:
+    """Host-side ARP endpoint for Home Assistant running in Docker.
+
+    Serves `GET /arp/<ip>` with a list holding at most one {"ip", "mac"} entry
+    and `POST /arp {"ips": [...]}` with the entries of every known IP, the
+    two forms ArpHostClient understands. Answers come from fixtures when
+    given, otherwise from the host's neighbor table.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_ARP_HOST_PORT,
+        fixtures: Optional[dict[str, str]] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        latency: float = 0.0,
+    ):
+        self.host = host
+        self.port = port
+        self.fixtures = ArpHostClient.parse_entries(fixtures) if fixtures is not None else None
+        self.max_age = max_age
+        # Simulated per-request cost, for benchmarks.
+        self.latency = latency
+        self.neighbor_table = NeighborTable()
+        self._lock = asyncio.Lock()
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/arp/{ip}", self._handle_one)
+        app.router.add_post("/arp", self._handle_batch)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        source = f"{len(self.fixtures)} fixtures" if self.fixtures is not None else "the neighbor table"
+        logger.info("Serving ARP lookups from %s on %s", source, self.url)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def get_entries(self) -> dict[str, str]:
+        if self.fixtures is not None:
+            return self.fixtures
+
+        async with self._lock:
+            # Concurrent requests share one dump instead of each reading the kernel table.
+            if time.monotonic() - self.neighbor_table.refreshed_at >= self.max_age:
+                if not await self.neighbor_table.refresh():
+                    logger.warning("No neighbor table available on this host")
+
+        return self.neighbor_table.entries
+
+    async def _handle_one(self, request: web.Request) -> web.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        ip = request.match_info["ip"]
+        mac = (await self.get_entries()).get(ip)
+        return web.json_response([{"ip": ip, "mac": mac}] if mac else [])
+
+    async def _handle_batch(self, request: web.Request) -> web.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        try:
+            ips = (await request.json()).get("ips")
+        except (ValueError, AttributeError):
+            ips = None
+        if not isinstance(ips, list):
+            return web.json_response({"error": 'expected {"ips": [...]}'}, status=400)
+
+        entries = await self.get_entries()
+        return web.json_response([{"ip": ip, "mac": entries[ip]} for ip in ips if ip in entries])
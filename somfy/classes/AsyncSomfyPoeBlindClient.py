@@ -0,0 +1,267 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Optional, Callable
+
+import aiohttp
+from yarl import URL
+
+from .CircuitBreaker import CircuitBreaker
+from .ClientMetrics import ClientMetrics
+from .RequestPolicy import RequestPolicy
+from .SomfyPoeBlindClient import LimitSetting, parse_command_response
+from ..dtos.somfy_objects import Status, Device
+from ..errors import SomfyAuthError, classify_error
+from ..utils.session import get_async_legacy_session, get_async_probe_session
+
+logger = logging.getLogger("Somfy Client")
+
+
+class AsyncSomfyPoeBlindClient:
+    """asyncio twin of SomfyPoeBlindClient that runs directly on the event loop."""
+
+    def __init__(
+        self, name, ip, password, on_failure,
+        session: Optional[aiohttp.ClientSession] = None, policy: Optional[RequestPolicy] = None,
+        metrics: Optional[ClientMetrics] = None
+    ):
+        # Without an explicit session, clients share the process-wide legacy-TLS pool.
+        self.session = session
+        self.name = name
+        self.ip = ip
+        self.password = password
+        self.on_failure = on_failure
+        self._login_lock = asyncio.Lock()
+        self.breaker = CircuitBreaker()
+        self.policy = policy or RequestPolicy()
+        self.metrics = metrics or ClientMetrics()
+        self._timeout = aiohttp.ClientTimeout(connect=self.policy.connect_timeout, sock_read=self.policy.read_timeout)
+
+    @classmethod
+    def init_with_device(
+        cls, device: dict, on_failure: Optional[Callable] = None,
+        session: Optional[aiohttp.ClientSession] = None, policy: Optional[RequestPolicy] = None,
+        metrics: Optional[ClientMetrics] = None
+    ):
+        if on_failure:
+            return cls(device["name"], device["ip"], device["pin"], on_failure, session, policy, metrics)
+
+        return cls(device["name"], device["ip"], device["pin"], lambda _: None, session, policy, metrics)
+
+    @staticmethod
+    def _get_log_prefix(instance=None):
+        if instance is None:
+            return "[Somfy Poe Blind Client]"
+
+        return f'[Somfy Poe Blind Client][{instance.name}]'
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = get_async_legacy_session()
+
+        return self.session
+
+    async def _notify_failure(self, e):
+        result = self.on_failure(e)
+        if inspect.isawaitable(result):
+            await result
+
+    def rebind(self, ip: str, password: str):
+        """Point the client at another address or PIN; the next command logs in again."""
+        if self.session is not None and not self.session.closed:
+            self.session.cookie_jar.clear_domain(self.ip)
+        self.ip = ip
+        self.password = password
+        self.breaker.reset()
+
+    def has_session(self) -> bool:
+        """True while the controller's sessionId cookie is present; the jar drops expired cookies."""
+        return self._get_session_id() is not None
+
+    async def _ensure_session(self):
+        async with self._login_lock:
+            # Concurrent commands share the login done by whichever got here first.
+            if not self.has_session():
+                await self.login()
+
+    async def _relogin(self, rejected_session):
+        async with self._login_lock:
+            if self._get_session_id() == rejected_session:
+                logger.info("%s Session expired, logging in again", self._get_log_prefix(self))
+                self.metrics.record_reconnect()
+                await self.login()
+
+    def _get_session_id(self) -> Optional[str]:
+        if self.session is None or self.session.closed:
+            return None
+
+        cookie = self.session.cookie_jar.filter_cookies(URL(f"https://{self.ip}/")).get("sessionId")
+        return cookie.value if cookie is not None else None
+
+    async def login(self) -> bool:
+        session = self._get_session()
+        # Drop only this controller's cookie; pooled connections stay warm.
+        session.cookie_jar.clear_domain(self.ip)
+        started = time.monotonic()
+        try:
+            async with session.post(
+                f"https://{self.ip}/", data={"password": self.password}, timeout=self._timeout
+            ) as login_response:
+                text = await login_response.text()
+        finally:
+            self.metrics.observe("login", time.monotonic() - started)
+
+        cookies = session.cookie_jar.filter_cookies(URL(f"https://{self.ip}/"))
+        if "sessionId" not in cookies:
+            logger.error("%s Login failed. No sessionId found.", self._get_log_prefix(self))
+            logger.info("%s Response: %s", self._get_log_prefix(self), text)
+            return False
+
+        logger.debug("Cookies: %s", cookies)
+        logger.debug("%s Authenticated. Session ID: %s", self._get_log_prefix(self), cookies["sessionId"].value)
+        return True
+
+    @classmethod
+    async def ping(cls, ip, session: Optional[aiohttp.ClientSession] = None) -> bool:
+        session = session or get_async_probe_session()
+        try:
+            # Anything below 1.2s we will get a false negative from Somfy Device.
+            async with session.post(f"https://{ip}", data="", timeout=aiohttp.ClientTimeout(total=1.2)) as response:
+                return response.status == 200 and 'SOMFY PoE WebGUI' in await response.text()
+        except Exception as e:
+            logger.debug(e)
+            return False
+
+    async def send_command(
+        self,
+        command,
+        priority=None, position=None, direction=None, duration=None, end_limit: str = None, mode: str = None, wink: bool = None
+    ):
+        logger.debug("%s start command: %s", self._get_log_prefix(self), command)
+
+        params = {}
+        if priority is not None:
+            params["priority"] = priority
+        if position is not None:
+            params["position"] = position
+        if direction is not None:
+            params["direction"] = direction
+        if duration is not None:
+            params["duration"] = duration
+        if end_limit is not None:
+            params["endLimit"] = end_limit
+        if mode is not None:
+            params["mode"] = mode
+        if wink is not None:
+            params["wink"] = wink
+
+        command_payload = {
+            "method": command,
+            "params": params,
+            "id": 1
+        }
+        if not self.breaker.allow_request():
+            logger.debug("%s circuit open, skipping command: %s", self._get_log_prefix(self), command)
+            return None
+
+        started = time.monotonic()
+        try:
+            # The budget covers login, retries and backoff; the call is cancelled once it runs out.
+            async with asyncio.timeout(self.policy.latency_budget):
+                data = await self._send_with_retries(command, command_payload)
+        except asyncio.CancelledError:
+            self.breaker.abort_trial()
+            raise
+        except Exception as e:
+            error = classify_error(e, self.ip, command)
+            logger.error("%s failed command: %s (%s)", self._get_log_prefix(self), command, type(error).__name__)
+            self.metrics.observe(command, time.monotonic() - started)
+            self.metrics.record_error(command, error)
+            self.breaker.record_failure()
+            await self._notify_failure(error)
+            return None
+
+        self.metrics.observe(command, time.monotonic() - started)
+        if not self.breaker.available:
+            self.metrics.record_reconnect()
+        self.breaker.record_success()
+        logger.debug("%s completed command: %s", self._get_log_prefix(self), command)
+
+        return data
+
+    async def _send_with_retries(self, command: str, command_payload: dict) -> Optional[dict]:
+        attempts = self.policy.attempts(command)
+        for attempt in range(attempts):
+            try:
+                return await self._send_once(command_payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = classify_error(e, self.ip, command)
+                if attempt + 1 >= attempts or not self.policy.is_retryable(error):
+                    raise error
+
+                delay = self.policy.retry_delay(attempt)
+                logger.info("%s retrying %s in %.2fs: %s", self._get_log_prefix(self), command, delay, error)
+                await asyncio.sleep(delay)
+
+    async def _send_once(self, command_payload: dict) -> Optional[dict]:
+        await self._ensure_session()
+        session_id = self._get_session_id()
+        expired, data = await self._post_command(command_payload)
+        if expired:
+            # Re-authenticate only when the controller rejects the session, then retry once.
+            await self._relogin(session_id)
+            expired, data = await self._post_command(command_payload)
+            if expired:
+                raise SomfyAuthError("Session rejected after login")
+
+        return data
+
+    async def _post_command(self, command_payload: dict) -> tuple[bool, Optional[dict]]:
+        async with self._get_session().post(
+            f"https://{self.ip}/req", json=command_payload, timeout=self._timeout
+        ) as response:
+            return parse_command_response(response.status, await response.text())
+
+    async def get_status(self) -> Optional[Status]:
+        data = await self.send_command("status.position")
+        logger.debug(f"Status Response: {data}")
+        if data is None:
+            return None
+
+        status = Status.from_data(data)
+        logger.debug(f"Status object: {status}")
+        if status.error is not None:
+            logger.warning("%s Status, %s", self._get_log_prefix(self), status)
+
+        return status
+
+    async def get_info(self) -> Optional[Device]:
+        data = await self.send_command("status.info")
+        if not data or 'info' not in data:
+            return None
+
+        device = Device.from_data(data['info'])
+        device.ip = self.ip
+
+        return device
+
+    async def down(self):
+        await self.send_command("move.down", priority=0)
+
+    async def up(self):
+        await self.send_command("move.up", priority=0)
+
+    async def move(self, position: int):
+        await self.send_command("move.to", priority=1, position=position)
+
+    async def move_relative(self, direction: str, duration: int):
+        await self.send_command("settings.moverelative", direction=direction, duration=duration)
+
+    async def stop(self):
+        await self.send_command("move.stop", priority=1)
+
+    async def set_limit(self, setting: LimitSetting):
+        await self.send_command("settings.endlimit", end_limit=setting, mode="atcurrentposition")
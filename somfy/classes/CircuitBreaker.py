@@ -0,0 +1,72 @@
+import random
+import time
+from enum import Enum
+from typing import Optional
+
+
+class CircuitState(Enum):
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half_open'
+
+
+class CircuitBreaker:
+    """Stops sending requests to a controller that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are refused until the backoff elapses. Then one trial request
+    is let through: success closes the circuit, failure reopens it with a
+    doubled (jittered) backoff up to `max_backoff`.
+    """
+
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 5, max_backoff: float = 300):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = CircuitState.closed
+        self.failures = 0
+        self.trips = 0
+        self.retry_at: Optional[float] = None
+
+    @property
+    def available(self) -> bool:
+        return self.state == CircuitState.closed
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.closed:
+            return True
+
+        if self.state == CircuitState.open and time.monotonic() >= self.retry_at:
+            self.state = CircuitState.half_open
+            return True
+
+        # Open and still backing off, or a half-open trial is already in flight.
+        return False
+
+    def record_success(self):
+        self.reset()
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == CircuitState.half_open or self.failures >= self.failure_threshold:
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** self.trips)
+            self.trips += 1
+            self.state = CircuitState.open
+            self.retry_at = time.monotonic() + backoff * random.uniform(0.8, 1.2)
+
+    def abort_trial(self):
+        """Forget a half-open trial that ended without an answer, e.g. when cancelled."""
+        if self.state == CircuitState.half_open:
+            self.state = CircuitState.open
+
+    def reset(self):
+        self.state = CircuitState.closed
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = None
+
+    def seconds_until_retry(self) -> float:
+        if self.retry_at is None:
+            return 0
+
+        return max(0.0, self.retry_at - time.monotonic())
@@ -0,0 +1,120 @@
+import math
+import threading
+from collections import deque
+from typing import Optional
+
+# Upper bounds, in seconds, of the exported latency buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+# Recent samples kept per method for percentiles.
+LATENCY_WINDOW = 512
+
+
+class LatencyHistogram:
+    """Latency of one method: cumulative buckets for export, recent samples for percentiles."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = deque(maxlen=window)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        self.samples.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def cumulative_buckets(self) -> list[tuple[float, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            total += count
+            result.append((bound, total))
+
+        return result
+
+    def percentile(self, q: float) -> Optional[float]:
+        return percentile(self.samples, q)
+
+
+def percentile(samples, q: float) -> Optional[float]:
+    """Nearest-rank percentile, q in 0-100."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+class ClientMetrics:
+    """Latency, error and reconnect counters of one controller.
+
+    Latency is recorded per method (status.position, move.to, login, ...)
+    for every call that reached the controller, failed or not. A reconnect
+    is a re-login after the controller rejected the session, or the first
+    success after the circuit breaker opened.
+    """
+
+    def __init__(self):
+        self.latency: dict[str, LatencyHistogram] = {}
+        self.errors: dict[tuple[str, str], int] = {}
+        self.reconnects = 0
+        # The sync client records from executor threads.
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, seconds: float):
+        with self._lock:
+            self.latency.setdefault(method, LatencyHistogram()).observe(seconds)
+
+    def record_error(self, method: str, error: BaseException):
+        with self._lock:
+            key = (method, type(error).__name__)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def record_reconnect(self):
+        with self._lock:
+            self.reconnects += 1
+
+    @property
+    def error_count(self) -> int:
+        with self._lock:
+            return sum(self.errors.values())
+
+    @property
+    def request_count(self) -> int:
+        with self._lock:
+            return sum(histogram.count for histogram in self.latency.values())
+
+    def percentile(self, q: float, method: Optional[str] = None) -> Optional[float]:
+        with self._lock:
+            if method is not None:
+                histogram = self.latency.get(method)
+                return histogram.percentile(q) if histogram else None
+
+            return percentile([s for histogram in self.latency.values() for s in histogram.samples], q)
+
+    def snapshot(self) -> tuple[dict, dict, int]:
+        """Consistent copy for export: ({method: (cumulative buckets, sum, count)}, errors, reconnects)."""
+        with self._lock:
+            latency = {
+                method: (histogram.cumulative_buckets(), histogram.sum, histogram.count)
+                for method, histogram in self.latency.items()
+            }
+            return latency, dict(self.errors), self.reconnects
+
+    def summary(self) -> dict:
+        """Per-method count and p50/p95/p99 in milliseconds."""
+        with self._lock:
+            return {
+                method: {
+                    "count": histogram.count,
+                    **{
+                        f"p{q}": round(histogram.percentile(q) * 1000, 1)
+                        for q in (50, 95, 99) if histogram.samples
+                    },
+                }
+                for method, histogram in self.latency.items()
+            }
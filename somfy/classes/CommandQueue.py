@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .AsyncSomfyPoeBlindClient import AsyncSomfyPoeBlindClient
+
+logger = logging.getLogger("Command Queue")
+
+# Minimum seconds between two commands sent to the same controller; the
+# integration lets a device's "command_spacing" option override it.
+DEFAULT_COMMAND_SPACING = 0.3
+MOVE_COMMANDS = ("move.up", "move.down", "move.to")
+STOP_COMMAND = "move.stop"
+
+
+@dataclass
+class SentCommand:
+    """The command a controller was actually sent and its answer."""
+    command: str
+    params: dict
+    result: Optional[dict] = None
+
+
+@dataclass
+class _PendingCommand:
+    command: str
+    params: dict
+    futures: list = field(default_factory=list)
+
+
+class CommandQueue:
+    """Serialises commands to one controller and merges superseded ones.
+
+    A queued move is replaced by any later move, so dragging a slider sends
+    only the last move.to. A stop drops every queued move, but nothing drops
+    a queued stop: moves issued after it are sent after it. Callers whose
+    command was merged away receive the SentCommand that replaced it.
+    """
+
+    def __init__(self, client: AsyncSomfyPoeBlindClient, min_spacing: float = DEFAULT_COMMAND_SPACING):
+        self.client = client
+        self.min_spacing = min_spacing
+        self._pending: list[_PendingCommand] = []
+        self._in_flight: Optional[_PendingCommand] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._last_sent = 0.0
+
+    @property
+    def ip(self):
+        return self.client.ip
+
+    @property
+    def name(self):
+        return self.client.name
+
+    async def send_command(self, command: str, **params) -> Optional[dict]:
+        """Same contract as the client's send_command, so a queue can stand in for it."""
+        return (await self.submit(command, **params)).result
+
+    async def submit(self, command: str, **params) -> SentCommand:
+        future = asyncio.get_running_loop().create_future()
+        entry = _PendingCommand(command, params, [future])
+
+        queued_stop = next((p for p in self._pending if p.command == STOP_COMMAND), None)
+        if command == STOP_COMMAND:
+            superseded = [p for p in self._pending if p.command in MOVE_COMMANDS]
+        elif command in MOVE_COMMANDS:
+            # Moves queued ahead of a stop were dropped by it, so only those after it can be replaced.
+            start = self._pending.index(queued_stop) + 1 if queued_stop is not None else 0
+            superseded = [p for p in self._pending[start:] if p.command in MOVE_COMMANDS]
+        else:
+            superseded = []
+
+        for pending in superseded:
+            logger.debug("%s superseded by %s on %s", pending.command, command, self.ip)
+            entry.futures.extend(pending.futures)
+            self._pending.remove(pending)
+
+        if command == STOP_COMMAND and queued_stop is not None:
+            # A queued stop is never dropped; a second stop just waits for it.
+            queued_stop.futures.extend(entry.futures)
+        else:
+            self._pending.append(entry)
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._drain())
+
+        return await asyncio.shield(future)
+
+    async def _drain(self):
+        while self._pending:
+            wait = self._last_sent + self.min_spacing - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            entry = self._in_flight = self._pending.pop(0)
+            self._last_sent = time.monotonic()
+            try:
+                result = await self.client.send_command(entry.command, **entry.params)
+            except Exception as e:
+                for future in entry.futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self._in_flight = None
+                self._last_sent = time.monotonic()
+
+            sent = SentCommand(entry.command, entry.params, result)
+            for future in entry.futures:
+                if not future.done():
+                    future.set_result(sent)
+
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+        entries = self._pending + ([self._in_flight] if self._in_flight is not None else [])
+        for entry in entries:
+            for future in entry.futures:
+                if not future.done():
+                    future.cancel()
+        self._pending = []
+        self._in_flight = None
+
+    async def up(self) -> SentCommand:
+        return await self.submit("move.up", priority=0)
+
+    async def down(self) -> SentCommand:
+        return await self.submit("move.down", priority=0)
+
+    async def move(self, position: int) -> SentCommand:
+        return await self.submit("move.to", priority=1, position=position)
+
+    async def stop(self) -> SentCommand:
+        return await self.submit(STOP_COMMAND, priority=1)
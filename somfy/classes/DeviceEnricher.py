@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from .AsyncSomfyPoeBlindClient import AsyncSomfyPoeBlindClient
+from ..dtos.somfy_objects import Device
+
+logger = logging.getLogger("Device Enricher")
+
+DEFAULT_ENRICH_CONCURRENCY = 16
+
+
+class DeviceEnricher:
+    """Turns discovered (ip, mac) candidates into Device DTOs.
+
+    Each candidate is confirmed to be a Somfy controller, logged into with
+    each known PIN in turn, and asked for status.info. Candidates are handled
+    concurrently and yielded as soon as each one finishes.
+    """
+
+    def __init__(self, pins: Iterable[str], max_concurrency: int = DEFAULT_ENRICH_CONCURRENCY):
+        self.pins = list(dict.fromkeys(pins))
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def enrich(self, candidates: dict[str, str]):
+        """Yield (ip, mac, pin, device) per candidate; pin and device are None when it could not be enriched."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def enrich_one(ip, mac):
+            async with semaphore:
+                try:
+                    return await self.enrich_one(ip, mac)
+                except Exception as e:
+                    logger.info("Unable to enrich %s: %s", ip, e)
+                    return ip, mac, None, None
+
+        for task in asyncio.as_completed([enrich_one(ip, mac) for ip, mac in candidates.items()]):
+            yield await task
+
+    async def enrich_one(self, ip: str, mac: str) -> tuple[str, str, Optional[str], Optional[Device]]:
+        if not await AsyncSomfyPoeBlindClient.ping(ip):
+            logger.info("%s is not a Somfy PoE controller", ip)
+            return ip, mac, None, None
+
+        for pin in self.pins:
+            client = AsyncSomfyPoeBlindClient("Draft", ip, pin, lambda _: None)
+            if not await client.login():
+                continue
+
+            device = await client.get_info()
+            if device is not None:
+                logger.info("Enriched %s as %s", ip, device.name)
+                return ip, mac, pin, device
+
+        return ip, mac, None, None
@@ -0,0 +1,59 @@
+import asyncio
+import inspect
+import logging
+from typing import Awaitable, Callable, Optional, Union
+
+from ..errors import SomfyError
+
+logger = logging.getLogger("Failure Channel")
+
+
+class FailureChannel:
+    """Delivers client failures to a handler on the event loop.
+
+    The channel is itself the on_failure callback: it may be called from the
+    loop or from an executor thread, returns immediately, and runs the handler
+    as its own task so recovery never blocks the request that failed.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[SomfyError], Union[Awaitable[None], None]],
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self.handler = handler
+        self.loop = loop or asyncio.get_running_loop()
+        self._tasks = set()
+        self._closed = False
+
+    def __call__(self, error: SomfyError):
+        if not self._closed:
+            self.loop.call_soon_threadsafe(self._dispatch, error)
+
+    def _dispatch(self, error: SomfyError):
+        if self._closed:
+            return
+
+        try:
+            result = self.handler(error)
+        except Exception:
+            logger.exception("Failure handler raised for %s", error)
+            return
+
+        if inspect.isawaitable(result):
+            task = self.loop.create_task(self._run(result, error))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _run(awaitable, error):
+        try:
+            await awaitable
+        except Exception:
+            logger.exception("Failure handler raised for %s", error)
+
+    def cancel(self):
+        """Stop delivering failures and cancel the handlers still running."""
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
@@ -0,0 +1,65 @@
+import time
+from typing import Optional
+
+# Percent of travel per second assumed until a move has been observed.
+DEFAULT_SPEED = 5.0
+# Never extrapolate further than this past the last real reading.
+MAX_EXTRAPOLATION = 2.0
+
+
+class MotionTracker:
+    """Estimates a shade's position between status polls.
+
+    Positions are 0 (closed) to 100 (open); direction is +1 while opening,
+    -1 while closing and 0 when stopped. Speed is learned from consecutive
+    readings of the same move.
+    """
+
+    def __init__(self, default_speed: float = DEFAULT_SPEED):
+        self.position: Optional[float] = None
+        self.direction = 0
+        self.target: Optional[float] = None
+        self.speed = default_speed
+        self.updated_at: Optional[float] = None
+
+    def start(self, direction: int, target: Optional[float] = None, at: Optional[float] = None):
+        """Record that a move was commanded, before the controller reports it."""
+        self.direction = direction
+        self.target = target
+        if self.position is not None:
+            self.updated_at = at if at is not None else time.monotonic()
+
+    def update(self, position: float, direction: int, at: Optional[float] = None):
+        at = at if at is not None else time.monotonic()
+        if (
+            self.position is not None
+            and direction != 0
+            and direction == self.direction
+            and self.updated_at is not None
+            and at > self.updated_at
+            and position != self.position
+        ):
+            observed = abs(position - self.position) / (at - self.updated_at)
+            self.speed = (self.speed + observed) / 2
+
+        if direction == 0:
+            self.target = None
+
+        self.position = position
+        self.direction = direction
+        self.updated_at = at
+
+    def estimate(self, at: Optional[float] = None) -> Optional[float]:
+        if self.position is None or self.direction == 0 or self.updated_at is None:
+            return self.position
+
+        at = at if at is not None else time.monotonic()
+        elapsed = min(max(at - self.updated_at, 0), MAX_EXTRAPOLATION)
+        estimate = self.position + self.direction * self.speed * elapsed
+
+        limit = self.target
+        if limit is None:
+            limit = 100 if self.direction > 0 else 0
+        if self.direction > 0:
+            return min(estimate, limit)
+        return max(estimate, limit)
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from typing import Iterable
+
+logger = logging.getLogger("Neighbor Table")
+
+PROC_NET_ARP = "/proc/net/arp"
+# ATF_COM: the entry is complete and carries a usable hardware address.
+ATF_COM = 0x2
+
+
+class NeighborTable:
+    """IP -> MAC index built from one dump of the kernel neighbor table."""
+
+    def __init__(self, prefixes: Iterable[str] = (), path: str = PROC_NET_ARP):
+        self.prefixes = tuple(prefix.upper() for prefix in prefixes)
+        self.path = path
+        self.entries: dict[str, str] = {}
+        self.matches: dict[str, str] = {}
+        self.refreshed_at = 0.0
+        self.available = True
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def normalize_mac(mac: str) -> str:
+        return ":".join(part.zfill(2) for part in mac.split(":")).upper()
+
+    def is_match(self, mac: str) -> bool:
+        return not self.prefixes or mac.startswith(self.prefixes)
+
+    async def refresh(self) -> bool:
+        """Reload the whole table. Returns False when no neighbor source is available."""
+        entries = await asyncio.get_running_loop().run_in_executor(None, self._read_proc)
+        if entries is None:
+            entries = await self._read_ip_neigh()
+
+        if entries is None:
+            self.available = False
+            return False
+
+        self.entries = entries
+        self.matches = {ip: mac for ip, mac in entries.items() if self.is_match(mac)}
+        self.refreshed_at = time.monotonic()
+        logger.debug("Loaded %s neighbors, %s matching", len(self.entries), len(self.matches))
+        return True
+
+    async def lookup(self, ip: str, seen_at: float | None = None) -> str | None:
+        """Return the MAC for ip, refreshing only if the table predates seen_at."""
+        mac = self.entries.get(ip)
+        if mac is not None or not self.available:
+            return mac
+
+        if seen_at is not None and self.refreshed_at >= seen_at:
+            return None
+
+        async with self._lock:
+            # Another probe may have refreshed the table while we waited.
+            if seen_at is None or self.refreshed_at < seen_at:
+                await self.refresh()
+
+        return self.entries.get(ip)
+
+    def find_ip(self, mac: str) -> str | None:
+        mac = self.normalize_mac(mac)
+        for ip, entry_mac in self.entries.items():
+            if entry_mac == mac:
+                return ip
+
+        return None
+
+    def _read_proc(self) -> dict[str, str] | None:
+        try:
+            with open(self.path, encoding="ascii") as f:
+                lines = f.read().splitlines()[1:]
+        except OSError:
+            return None
+
+        entries = {}
+        for line in lines:
+            parts = line.split()
+            if len(parts) < 4:
+                continue
+
+            ip, flags, mac = parts[0], parts[2], parts[3]
+            try:
+                if not int(flags, 16) & ATF_COM:
+                    continue
+            except ValueError:
+                continue
+
+            entries[ip] = self.normalize_mac(mac)
+
+        return entries
+
+    async def _read_ip_neigh(self) -> dict[str, str] | None:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "ip", "-4", "neigh", "show",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+
+        stdout, _ = await process.communicate()
+        if process.returncode != 0:
+            return None
+
+        entries = {}
+        for line in stdout.decode().splitlines():
+            parts = line.split()
+            if "lladdr" not in parts:
+                continue
+
+            mac_index = parts.index("lladdr") + 1
+            if mac_index < len(parts) and parts[-1] not in ("FAILED", "INCOMPLETE"):
+                entries[parts[0]] = self.normalize_mac(parts[mac_index])
+
+        return entries
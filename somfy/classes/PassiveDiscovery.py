@@ -0,0 +1,92 @@
+import asyncio
+import ipaddress
+import logging
+from typing import Callable, Optional
+
+from .NeighborTable import NeighborTable
+from .Scanner import SOMFY_MAC_PREFIXES
+
+logger = logging.getLogger("Passive Discovery")
+
+# Seconds between reads of the kernel neighbor table.
+DEFAULT_NEIGHBOR_INTERVAL = 30
+
+
+class PassiveDiscovery:
+    """Collects Somfy (ip, mac) pairs without sending any probes.
+
+    Devices are reported by external listeners through add(), e.g. DHCP
+    requests seen by Home Assistant, and by watching the kernel neighbor
+    table, which picks up gratuitous ARP and any other traffic from the shades.
+    """
+
+    def __init__(self, subnet: str, interval: float = DEFAULT_NEIGHBOR_INTERVAL):
+        self.network = ipaddress.IPv4Network(subnet)
+        self.interval = interval
+        self.neighbor_table = NeighborTable(SOMFY_MAC_PREFIXES)
+        self.devices: dict[str, str] = {}
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def normalize_mac(mac: str) -> str:
+        mac = mac.replace("-", ":")
+        if ":" not in mac and len(mac) == 12:
+            mac = ":".join(mac[i:i + 2] for i in range(0, 12, 2))
+
+        return NeighborTable.normalize_mac(mac)
+
+    def add(self, ip: str, mac: str) -> bool:
+        """Record a sighting; listeners are told about new devices and IP changes."""
+        mac = self.normalize_mac(mac)
+        if not mac.startswith(tuple(SOMFY_MAC_PREFIXES)):
+            return False
+
+        try:
+            if ipaddress.IPv4Address(ip) not in self.network:
+                return False
+        except ValueError:
+            return False
+
+        if self.devices.get(mac) == ip:
+            return False
+
+        logger.info("Passively discovered %s at %s", mac, ip)
+        self.devices[mac] = ip
+        for listener in list(self._listeners):
+            listener(ip, mac)
+
+        return True
+
+    def known_ips(self) -> dict[str, str]:
+        return {ip: mac for mac, ip in self.devices.items()}
+
+    def add_listener(self, listener: Callable[[str, str], None]) -> Callable[[], None]:
+        self._listeners.append(listener)
+
+        def remove():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._watch_neighbors())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch_neighbors(self):
+        while True:
+            if not await self.neighbor_table.refresh():
+                logger.info("No neighbor table available; relying on DHCP announcements only")
+                return
+
+            for ip, mac in self.neighbor_table.matches.items():
+                self.add(ip, mac)
+
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,36 @@
+import random
+from dataclasses import dataclass
+
+from ..errors import SomfyError, SomfyTimeoutError, SomfyConnectionError, SomfyHttpError
+
+
+@dataclass
+class RequestPolicy:
+    """Timeouts and retry rules for requests to one controller.
+
+    Only idempotent methods (status.*) are retried. latency_budget bounds a
+    whole call, including retries and a re-login, so calls cannot pile up
+    behind a dead controller.
+    """
+    connect_timeout: float = 3.0
+    read_timeout: float = 5.0
+    retries: int = 2
+    backoff: float = 0.25
+    jitter: float = 0.25
+    latency_budget: float = 10.0
+
+    @staticmethod
+    def is_idempotent(command: str) -> bool:
+        return command.startswith("status.")
+
+    def attempts(self, command: str) -> int:
+        return 1 + (self.retries if self.is_idempotent(command) else 0)
+
+    @staticmethod
+    def is_retryable(error: SomfyError) -> bool:
+        if isinstance(error, SomfyHttpError):
+            return error.status >= 500
+        return isinstance(error, (SomfyTimeoutError, SomfyConnectionError))
+
+    def retry_delay(self, attempt: int) -> float:
+        return self.backoff * 2 ** attempt + random.uniform(0, self.jitter)
@@ -1,40 +1,113 @@
+import asyncio
 import logging
 import ipaddress
 import re
 import subprocess
-import aiohttp
+import time
+from typing import Iterable, Iterator
+
+from .ArpHostClient import ArpHostClient
+from .NeighborTable import NeighborTable
 
 logger = logging.getLogger("Network Scanner")
 SOMFY_MAC_PREFIXES = [
     "4C:C2:06"
 ]
 
+# Number of hosts probed at the same time during a sweep.
+DEFAULT_CONCURRENCY = 64
+
+
 class Scanner:
-    def __init__(self, subnet, use_mac_mock = False, base_url: str = "http://host.docker.internal:5001"):
+    def __init__(
+        self,
+        subnet,
+        use_mac_mock = False,
+        base_url: str = "http://host.docker.internal:5001",
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ping_timeout: int = 1,
+        use_neighbor_table: bool = True,
+    ):
         self.subnet = subnet
         self.use_mac_mock = use_mac_mock
         self.base_url = base_url
+        self.concurrency = max(1, concurrency)
+        self.ping_timeout = ping_timeout
+        self.use_neighbor_table = use_neighbor_table
+        self.neighbor_table = NeighborTable(SOMFY_MAC_PREFIXES)
+        # One keep-alive session to the ARP host for the lifetime of the scanner.
+        self.arp_host = ArpHostClient(base_url, limit=min(self.concurrency, 16))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.arp_host.close()
 
 
-    async def get_devices(self):
+    async def get_devices(self, exclude: Iterable[str] = ()):
+        """Sweep the subnet concurrently, yielding (ip, mac) as soon as each match is found.
+
+        Addresses in exclude, e.g. devices already verified from a cache, are skipped.
+        """
         logger.info("Searchin for devices in %s", self.subnet)
 
-        check_count = 0
-        found_count = 0
-        for ip in ipaddress.IPv4Network(self.subnet).hosts():
-            ip_str = str(ip)
-            # Use for testing
-            # if ip_str not in ['10.0.7.117']:
-            #     continue
-
-            mac_address = await self.ping_and_get_mac(ip_str)
-            if mac_address and self.is_mac_match(mac_address):
-                found_count += 1
+        exclude = set(exclude)
+        hosts = (str(ip) for ip in ipaddress.IPv4Network(self.subnet).hosts())
+        async for ip_str, mac_address in self._probe(ip for ip in hosts if ip not in exclude):
+            yield ip_str, mac_address
+
+    async def verify_devices(self, known: dict[str, str]):
+        """Probe only known ip -> mac pairs, yielding the ones still answering with that MAC."""
+        logger.info("Verifying %s known devices", len(known))
+
+        async for ip_str, mac_address in self._probe(iter(known)):
+            if mac_address == known[ip_str].upper():
                 yield ip_str, mac_address
 
-            check_count += 1
-            if check_count % 25 == 0:
-                logger.info(f"Checked {check_count} ips.  Found {found_count} ips.")
+    async def _probe(self, hosts: Iterator[str]):
+        results = asyncio.Queue()
+
+        async def worker():
+            # Workers share one host iterator so at most `concurrency` probes are in flight.
+            try:
+                for ip_str in hosts:
+                    try:
+                        mac_address = await self.ping_and_get_mac(ip_str)
+                    except Exception as e:
+                        logger.debug("Probe for %s failed: %s", ip_str, e)
+                        mac_address = None
+                    await results.put((ip_str, mac_address))
+            finally:
+                results.put_nowait(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+
+        check_count = 0
+        found_count = 0
+        running = len(workers)
+        try:
+            while running:
+                result = await results.get()
+                if result is None:
+                    running -= 1
+                    continue
+
+                ip_str, mac_address = result
+                check_count += 1
+                if mac_address and self.is_mac_match(mac_address):
+                    found_count += 1
+                    yield ip_str, mac_address
+
+                if check_count % 25 == 0:
+                    logger.info(f"Checked {check_count} ips.  Found {found_count} ips.")
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
     @staticmethod
     def is_mac_match(mac_address: str):
@@ -44,23 +117,48 @@ class Scanner:
 
         return False
 
-    async def ping_and_get_mac(self, ip):
-        logger.info(f"Pinging {ip}")
+    async def ping(self, ip) -> bool:
+        """Send a single ICMP echo without blocking the event loop."""
         try:
-            subprocess.run(
-                ["ping", "-c", "1", "-W", "1", ip],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True
+            process = await asyncio.create_subprocess_exec(
+                "ping", "-c", "1", "-W", str(self.ping_timeout), ip,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
             )
-        except subprocess.CalledProcessError:
+        except OSError as e:
+            logger.error("Unable to run ping: %s", e)
+            return False
+
+        try:
+            return await process.wait() == 0
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+            raise
+
+    async def ping_and_get_mac(self, ip):
+        logger.debug(f"Pinging {ip}")
+        if not await self.ping(ip):
             return None
 
+        replied_at = time.monotonic()
         logger.info(f"Find mac for {ip}")
         if self.use_mac_mock:
             return await self.get_mac_from_host_async(ip)
-        else:
-            return self.get_mac(ip)
+
+        if self.use_neighbor_table and self.neighbor_table.available:
+            mac_address = await self.neighbor_table.lookup(ip, replied_at)
+            if mac_address is not None or self.neighbor_table.available:
+                return mac_address
+
+        return await self.get_mac_async(ip)
+
+    async def get_known_devices(self) -> dict[str, str]:
+        """Return every Somfy device currently in the neighbor table, without probing."""
+        if not await self.neighbor_table.refresh():
+            return {}
+
+        return dict(self.neighbor_table.matches)
 
     @staticmethod
     def get_mac(ip: str) -> str | None:
@@ -70,6 +168,30 @@ class Scanner:
             return None
 
         logger.info(f"get_mac: {output}")
+        return Scanner.parse_mac(output)
+
+    @staticmethod
+    async def get_mac_async(ip: str) -> str | None:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "arp", "-n", ip,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logger.error("Unable to run arp: %s", e)
+            return None
+
+        stdout, _ = await process.communicate()
+        if process.returncode != 0:
+            return None
+
+        output = stdout.decode()
+        logger.info(f"get_mac: {output}")
+        return Scanner.parse_mac(output)
+
+    @staticmethod
+    def parse_mac(output: str) -> str | None:
         # Match MAC parts that may be 1 or 2 hex digits
         m = re.search(r"(([0-9a-fA-F]{1,2}:){5}[0-9a-fA-F]{1,2})", output)
         if not m:
@@ -82,24 +204,4 @@ class Scanner:
 
     async def get_mac_from_host_async(self, ip: str) -> str | None:
         """Call host ARP endpoint (async) and return MAC or None."""
-        # session = aiohttp_client.async_get_clientsession(hass)
-        session = aiohttp.ClientSession()
-        url = f"{self.base_url}/arp/{ip}"
-        try:
-            timeout = aiohttp.ClientTimeout(total=2)
-            async with session.get(url, timeout=timeout) as resp:
-                if resp.status != 200:
-                    logger.info("ARP endpoint %s returned HTTP %s", url, resp.status)
-                    return None
-
-                data = await resp.json(content_type=None)
-                logger.info(f"ARP endpoint {url} returned {data}")
-                if isinstance(data, list) and data:
-                    mac = data[0].get("mac")
-                    return mac.upper() if mac else None
-                return None
-        except Exception as e:
-            logger.info("ARP request failed %s: %s", url, e)
-            return None
-        finally:
-            await session.close()
+        return await self.arp_host.lookup(ip)
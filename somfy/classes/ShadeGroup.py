@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+from typing import Iterable
+
+from .AsyncSomfyPoeBlindClient import AsyncSomfyPoeBlindClient
+from .CommandQueue import CommandQueue, SentCommand
+from ..dtos.somfy_objects import CommandResult
+
+logger = logging.getLogger("Shade Group")
+
+# Commands in flight at once when fanning out to a group.
+DEFAULT_FAN_OUT = 32
+
+
+class ShadeGroup:
+    """Sends one command to many controllers concurrently with a bounded fan-out.
+
+    Members are AsyncSomfyPoeBlindClient or CommandQueue instances.
+    """
+
+    def __init__(self, clients: Iterable[AsyncSomfyPoeBlindClient], max_concurrency: int = DEFAULT_FAN_OUT):
+        self.clients = list(clients)
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def send_command(self, command: str, **params) -> list[CommandResult]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def dispatch(client):
+            async with semaphore:
+                start = time.monotonic()
+                if isinstance(client, CommandQueue):
+                    sent = await client.submit(command, **params)
+                else:
+                    sent = SentCommand(command, params, await client.send_command(command, **params))
+
+            data = sent.result
+            success = data is not None and data.get("result") is not False
+            return CommandResult(
+                client.ip, client.name, success, time.monotonic() - start, data, sent.command, sent.params
+            )
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(dispatch(client) for client in self.clients))
+        logger.info(
+            "%s sent to %s shades in %.3fs, %s failed",
+            command, len(results), time.monotonic() - start, sum(1 for result in results if not result.success),
+        )
+        return results
+
+    async def up(self) -> list[CommandResult]:
+        return await self.send_command("move.up", priority=0)
+
+    async def down(self) -> list[CommandResult]:
+        return await self.send_command("move.down", priority=0)
+
+    async def move(self, position: int) -> list[CommandResult]:
+        return await self.send_command("move.to", priority=1, position=position)
+
+    async def stop(self) -> list[CommandResult]:
+        return await self.send_command("move.stop", priority=1)
@@ -1,11 +1,16 @@
+import json
 import logging
+import time
 
 import urllib3
 from typing import Optional, Callable
 from enum import Enum
 
 from ..dtos.somfy_objects import Status, Device
+from ..errors import SomfyAuthError, SomfyHttpError, SomfyTimeoutError, classify_error
 from ..utils.session import get_legacy_session
+from .ClientMetrics import ClientMetrics
+from .RequestPolicy import RequestPolicy
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 logger = logging.getLogger("Somfy Client")
@@ -14,24 +19,56 @@ SOMFY_MAC_PREFIXES = [
     "4C:C2:06",
 ]
 
+# HTTP statuses the controller answers with once the sessionId is no longer valid.
+SESSION_EXPIRED_STATUSES = (401, 403)
+
+
 class LimitSetting(Enum):
     up = 'up'
     down = 'down'
 
+
+def parse_command_response(status_code: int, text: str) -> tuple[bool, Optional[dict]]:
+    """Return (session_expired, data) for a /req response.
+
+    An expired session is answered with an auth error or with the HTML login
+    page instead of a JSON-RPC body.
+    """
+    if status_code in SESSION_EXPIRED_STATUSES:
+        return True, None
+    if status_code >= 400:
+        raise SomfyHttpError(f"HTTP {status_code}", status_code)
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return True, None
+
+    return False, data
+
+
 class SomfyPoeBlindClient:
-    def __init__(self, name, ip, password, on_failure):
+    def __init__(
+        self, name, ip, password, on_failure,
+        policy: Optional[RequestPolicy] = None, metrics: Optional[ClientMetrics] = None
+    ):
         self.session = None
         self.name = name
         self.ip = ip
         self.password = password
         self.on_failure = on_failure
+        self.policy = policy or RequestPolicy()
+        self.metrics = metrics or ClientMetrics()
 
     @classmethod
-    def init_with_device(cls, device: dict, on_failure: Optional[Callable] = None):
+    def init_with_device(
+        cls, device: dict, on_failure: Optional[Callable] = None,
+        policy: Optional[RequestPolicy] = None, metrics: Optional[ClientMetrics] = None
+    ):
         if on_failure:
-            return cls(device["name"], device["ip"], device["pin"], on_failure)
+            return cls(device["name"], device["ip"], device["pin"], on_failure, policy, metrics)
 
-        return cls(device["name"], device["ip"], device["pin"], lambda: None)
+        return cls(device["name"], device["ip"], device["pin"], lambda _: None, policy, metrics)
 
     @staticmethod
     def _get_log_prefix(instance=None):
@@ -40,21 +77,48 @@ class SomfyPoeBlindClient:
 
         return f'[Somfy Poe Blind Client][{instance.name}]'
 
-    def login(self):
-        self.session = get_legacy_session()
-        login_response = self.session.post(
-            f"https://{self.ip}/",
-            data={"password": self.password},
-            verify=False
-        )
+    def has_session(self) -> bool:
+        """True while the controller's sessionId cookie is present and unexpired."""
+        if self.session is None:
+            return False
+
+        self.session.cookies.clear_expired_cookies()
+        return "sessionId" in self.session.cookies
+
+    def _get_timeout(self, deadline: Optional[float] = None) -> tuple[float, float]:
+        """(connect, read) timeouts, shortened to what is left of the latency budget."""
+        if deadline is None:
+            return self.policy.connect_timeout, self.policy.read_timeout
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise SomfyTimeoutError("Latency budget exceeded")
+
+        return min(self.policy.connect_timeout, remaining), min(self.policy.read_timeout, remaining)
+
+    def login(self, deadline: Optional[float] = None) -> bool:
+        # Reuse the controller's pooled session; only the stale login cookie is discarded.
+        self.session = get_legacy_session(self.ip)
+        self.session.cookies.clear()
+        started = time.monotonic()
+        try:
+            login_response = self.session.post(
+                f"https://{self.ip}/",
+                data={"password": self.password},
+                verify=False,
+                timeout=self._get_timeout(deadline)
+            )
+        finally:
+            self.metrics.observe("login", time.monotonic() - started)
 
         if "sessionId" not in self.session.cookies:
             logger.error("%s Login failed. No sessionId found.", self._get_log_prefix(self))
             logger.info("%s Response: %s", self._get_log_prefix(self), login_response.text)
-            return
+            return False
 
         logger.debug("Cookies: %s", self.session.cookies)
         logger.debug("%s Authenticated. Session ID: %s", self._get_log_prefix(self), self.session.cookies["sessionId"])
+        return True
 
     @staticmethod
     def ping(ip) -> bool:
@@ -103,21 +167,64 @@ class SomfyPoeBlindClient:
             "params": params,
             "id": 1
         }
+        started = time.monotonic()
+        deadline = started + self.policy.latency_budget
         try:
-            response = self.session.post(
-                f"https://{self.ip}/req",
-                headers={"Content-Type": "application/json"},
-                json=command_payload,
-                verify=False
-            )
+            data = self._send_with_retries(command, command_payload, deadline)
         except Exception as e:
-            logger.error("%s failed command: %s", self._get_log_prefix(self), command)
-            self.on_failure(e)
+            error = classify_error(e, self.ip, command)
+            logger.error("%s failed command: %s (%s)", self._get_log_prefix(self), command, type(error).__name__)
+            self.metrics.observe(command, time.monotonic() - started)
+            self.metrics.record_error(command, error)
+            # Called from an executor thread: on_failure must be thread-safe, e.g. a FailureChannel.
+            self.on_failure(error)
             return None
 
+        self.metrics.observe(command, time.monotonic() - started)
         logger.debug("%s completed command: %s", self._get_log_prefix(self), command)
 
-        return response.json()
+        return data
+
+    def _send_with_retries(self, command: str, command_payload: dict, deadline: float) -> Optional[dict]:
+        attempts = self.policy.attempts(command)
+        for attempt in range(attempts):
+            try:
+                return self._send_once(command_payload, deadline)
+            except Exception as e:
+                error = classify_error(e, self.ip, command)
+                delay = self.policy.retry_delay(attempt)
+                if attempt + 1 >= attempts or not self.policy.is_retryable(error) or time.monotonic() + delay >= deadline:
+                    raise error
+
+                logger.info("%s retrying %s in %.2fs: %s", self._get_log_prefix(self), command, delay, error)
+                time.sleep(delay)
+
+    def _send_once(self, command_payload: dict, deadline: float) -> Optional[dict]:
+        if not self.has_session():
+            self.login(deadline)
+
+        expired, data = self._post_command(command_payload, deadline)
+        if expired:
+            # Re-authenticate only when the controller rejects the session, then retry once.
+            logger.info("%s Session expired, logging in again", self._get_log_prefix(self))
+            self.metrics.record_reconnect()
+            self.login(deadline)
+            expired, data = self._post_command(command_payload, deadline)
+            if expired:
+                raise SomfyAuthError("Session rejected after login")
+
+        return data
+
+    def _post_command(self, command_payload: dict, deadline: float) -> tuple[bool, Optional[dict]]:
+        response = self.session.post(
+            f"https://{self.ip}/req",
+            headers={"Content-Type": "application/json"},
+            json=command_payload,
+            verify=False,
+            timeout=self._get_timeout(deadline)
+        )
+
+        return parse_command_response(response.status_code, response.text)
 
     def get_status(self) -> Status:
         data = self.send_command("status.position")
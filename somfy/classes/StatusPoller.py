@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Hashable, Mapping, Optional
+
+from .AsyncSomfyPoeBlindClient import AsyncSomfyPoeBlindClient
+from ..dtos.somfy_objects import Status
+
+logger = logging.getLogger("Status Poller")
+
+DEFAULT_POLL_CONCURRENCY = 16
+# Seconds between consecutive poll starts, capped by max_spread for large installs.
+DEFAULT_POLL_STAGGER = 0.05
+DEFAULT_MAX_POLL_SPREAD = 10.0
+
+
+class StatusPoller:
+    """Reads status.position from many controllers in one batch.
+
+    Start times are staggered across a window and the number of requests in
+    flight is bounded, so a tick never hits every controller at the same instant.
+    on_result, when given, is called with each status as soon as it arrives.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_POLL_CONCURRENCY,
+        stagger: float = DEFAULT_POLL_STAGGER,
+        max_spread: float = DEFAULT_MAX_POLL_SPREAD,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.stagger = stagger
+        self.max_spread = max_spread
+
+    def get_spread(self, count: int) -> float:
+        return min(self.max_spread, self.stagger * count)
+
+    async def poll(
+        self,
+        clients: Mapping[Hashable, AsyncSomfyPoeBlindClient],
+        on_result: Optional[Callable[[Hashable, Optional[Status]], None]] = None,
+    ) -> dict[Hashable, Optional[Status]]:
+        if not clients:
+            return {}
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        step = self.get_spread(len(clients)) / len(clients)
+
+        async def poll_one(index, key):
+            client = clients[key]
+            await asyncio.sleep(index * step)
+            async with semaphore:
+                try:
+                    status = await client.get_status()
+                except Exception as e:
+                    logger.warning("Status poll for %s failed: %s", client.ip, e)
+                    status = None
+
+            if on_result is not None:
+                on_result(key, status)
+            return status
+
+        start = time.monotonic()
+        keys = list(clients)
+        statuses = await asyncio.gather(*(poll_one(index, key) for index, key in enumerate(keys)))
+        logger.debug("Polled %s shades in %.3fs", len(keys), time.monotonic() - start)
+
+        return dict(zip(keys, statuses))
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 
@@ -85,4 +85,25 @@ class Device:
             'hostname': self.hostname,
             'model': self.model,
             'name': self.name,
-        }
\ No newline at end of file
+        }
+
+@dataclass
+class CommandResult:
+    ip: str
+    name: Optional[str]
+    success: bool
+    elapsed: float
+    data: Optional[dict] = None
+    # The command the controller was actually sent; a queued command may have been merged into a later one.
+    command: Optional[str] = None
+    params: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            'ip': self.ip,
+            'name': self.name,
+            'success': self.success,
+            'command': self.command,
+            'elapsed': round(self.elapsed, 3),
+            'data': self.data,
+        }
@@ -0,0 +1,64 @@
+import asyncio
+import ssl
+from typing import Optional
+
+import aiohttp
+import requests
+
+
+class SomfyError(Exception):
+    """A failed request to a Somfy PoE controller."""
+
+    def __init__(self, message: str, ip: Optional[str] = None, command: Optional[str] = None, cause: Optional[BaseException] = None):
+        super().__init__(message)
+        self.ip = ip
+        self.command = command
+        self.cause = cause
+
+
+class SomfyTimeoutError(SomfyError):
+    """The controller did not answer in time."""
+
+
+class SomfyConnectionError(SomfyError):
+    """The controller could not be reached at its address."""
+
+
+class SomfyTlsError(SomfyError):
+    """The legacy TLS handshake with the controller failed."""
+
+
+class SomfyAuthError(SomfyError):
+    """The controller rejected the PIN or the session."""
+
+
+class SomfyHttpError(SomfyError):
+    """The controller answered with an unexpected HTTP status."""
+
+    def __init__(self, message: str, status: int, **kwargs):
+        super().__init__(message, **kwargs)
+        self.status = status
+
+
+def classify_error(e: BaseException, ip: Optional[str] = None, command: Optional[str] = None) -> SomfyError:
+    """Map a requests/aiohttp/ssl exception onto the SomfyError hierarchy."""
+    if isinstance(e, SomfyError):
+        e.ip = e.ip or ip
+        e.command = e.command or command
+        return e
+
+    kwargs = {"ip": ip, "command": command, "cause": e}
+    message = str(e) or type(e).__name__
+    # TLS and timeout errors subclass the connection errors, so they are checked first.
+    if isinstance(e, (ssl.SSLError, aiohttp.ClientSSLError, requests.exceptions.SSLError)):
+        return SomfyTlsError(message, **kwargs)
+    if isinstance(e, (asyncio.TimeoutError, TimeoutError, requests.exceptions.Timeout, aiohttp.ServerTimeoutError)):
+        return SomfyTimeoutError(message, **kwargs)
+    if isinstance(e, aiohttp.ClientResponseError):
+        return SomfyHttpError(message, e.status, **kwargs)
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        return SomfyHttpError(message, e.response.status_code, **kwargs)
+    if isinstance(e, (aiohttp.ClientConnectionError, requests.exceptions.ConnectionError, OSError)):
+        return SomfyConnectionError(message, **kwargs)
+
+    return SomfyError(message, **kwargs)
@@ -1,16 +1,180 @@
+import logging
 import ssl
+import threading
+import weakref
 
+import aiohttp
 import requests
 
 from ..classes.HttpAdapter import HttpAdapter
 
+logger = logging.getLogger("Somfy Session")
 
-def get_legacy_session():
-    ctx = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
-    ctx.options |= 0x4  # OP_LEGACY_SERVER_CONNECT
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
+# Idle keep-alive connections kept per controller.
+POOL_MAXSIZE_PER_HOST = 2
+POOL_HOSTS = 256
 
-    _session = requests.session()
-    _session.mount('https://', HttpAdapter(ctx))
-    return _session
\ No newline at end of file
+_lock = threading.Lock()
+_ssl_context = None
+_adapter = None
+_sessions: dict[str, requests.Session] = {}
+_async_session = None
+_async_probe_session = None
+
+
+class LegacySSLContext(ssl.SSLContext):
+    """Legacy-TLS client context that resumes TLS sessions per controller.
+
+    The controllers are addressed by IP, so peers are keyed by the connected
+    address for blocking sockets and by server_hostname for asyncio transports.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._tls_sessions = {}
+        self._tls_objects = {}
+        self._tls_lock = threading.Lock()
+
+    def _take_tls_session(self, key):
+        with self._tls_lock:
+            ref = self._tls_objects.pop(key, None)
+            ssl_object = ref() if ref is not None else None
+            if ssl_object is not None:
+                self._store_tls_session(key, ssl_object)
+
+            return self._tls_sessions.get(key)
+
+    def _store_tls_session(self, key, ssl_object):
+        try:
+            tls_session = ssl_object.session
+        except (ValueError, AttributeError):
+            return
+
+        if tls_session is not None:
+            self._tls_sessions[key] = tls_session
+
+    def wrap_socket(self, sock, *args, session=None, **kwargs):
+        try:
+            key = sock.getpeername()[:2]
+        except OSError:
+            key = None
+
+        if session is None and key is not None:
+            session = self._take_tls_session(key)
+
+        ssl_sock = super().wrap_socket(sock, *args, session=session, **kwargs)
+        if key is not None:
+            logger.debug("TLS connection to %s resumed: %s", key, ssl_sock.session_reused)
+            with self._tls_lock:
+                self._store_tls_session(key, ssl_sock)
+        return ssl_sock
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        key = server_hostname
+        if session is None and key is not None:
+            session = self._take_tls_session(key)
+
+        ssl_object = super().wrap_bio(
+            incoming, outgoing, server_side=server_side, server_hostname=server_hostname, session=session
+        )
+        if key is not None:
+            # The handshake has not happened yet; harvest the session on the next connect.
+            with self._tls_lock:
+                self._tls_objects[key] = weakref.ref(ssl_object)
+        return ssl_object
+
+
+def get_legacy_ssl_context() -> ssl.SSLContext:
+    """Return the process-wide legacy-TLS context.
+
+    Certificates are never verified, so the CA store is not loaded.
+    """
+    global _ssl_context
+    with _lock:
+        if _ssl_context is None:
+            ctx = LegacySSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            ctx.options |= 0x4  # OP_LEGACY_SERVER_CONNECT
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            _ssl_context = ctx
+
+        return _ssl_context
+
+
+def _get_adapter() -> HttpAdapter:
+    global _adapter
+    ctx = get_legacy_ssl_context()
+    with _lock:
+        if _adapter is None:
+            # urllib3 keeps one connection pool per (scheme, host, port), i.e. per controller.
+            _adapter = HttpAdapter(ctx, pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE_PER_HOST)
+
+        return _adapter
+
+
+def get_legacy_session(ip: str = None):
+    """Return a requests session backed by the shared legacy-TLS connection pool.
+
+    With an ip, the same session (and cookie jar) is returned for that controller
+    on every call; without one, a fresh cookie jar is used over the shared pool.
+    """
+    adapter = _get_adapter()
+    if ip is None:
+        _session = requests.session()
+        _session.mount('https://', adapter)
+        return _session
+
+    with _lock:
+        _session = _sessions.get(ip)
+        if _session is None:
+            _session = requests.session()
+            _session.mount('https://', adapter)
+            _sessions[ip] = _session
+
+        return _session
+
+
+def get_async_legacy_session() -> aiohttp.ClientSession:
+    """Return the process-wide aiohttp session used by every async shade client.
+
+    Must be called from the event loop. The connector pools connections per
+    controller and the cookie jar keeps each controller's sessionId apart.
+    """
+    global _async_session
+    if _async_session is None or _async_session.closed:
+        _async_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                ssl=get_legacy_ssl_context(),
+                limit=0,
+                limit_per_host=POOL_MAXSIZE_PER_HOST,
+            ),
+            # The controllers are addressed by IP, so the cookie jar must accept IP hosts.
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+        )
+
+    return _async_session
+
+
+def get_async_probe_session() -> aiohttp.ClientSession:
+    """Cookie-less view over the shared connector, for probes that must not touch logins."""
+    global _async_probe_session
+    session = get_async_legacy_session()
+    if _async_probe_session is None or _async_probe_session.closed or _async_probe_session.connector is not session.connector:
+        _async_probe_session = aiohttp.ClientSession(
+            connector=session.connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+
+    return _async_probe_session
+
+
+async def close_async_legacy_session():
+    global _async_session, _async_probe_session
+    if _async_probe_session is not None and not _async_probe_session.closed:
+        await _async_probe_session.close()
+    if _async_session is not None and not _async_session.closed:
+        await _async_session.close()
+
+    _async_session = None
+    _async_probe_session = None
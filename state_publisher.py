@@ -0,0 +1,47 @@
+from typing import Callable, Hashable
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+
+from .const import STATE_FRAME_INTERVAL
+
+
+class StatePublisher:
+    """Writes an entity's state only when it changed, at most once per frame.
+
+    Every publish() within `interval` seconds is merged into one write, and
+    the write is skipped when the entity's snapshot equals the last one written.
+    """
+
+    def __init__(self, entity: Entity, snapshot: Callable[[], Hashable], interval: float = STATE_FRAME_INTERVAL):
+        self._entity = entity
+        self._snapshot = snapshot
+        self._interval = interval
+        self._published = None
+        self._handle = None
+
+    @callback
+    def publish(self):
+        if self._entity.hass is None or self._handle is not None:
+            return
+
+        self._handle = self._entity.hass.loop.call_later(self._interval, self._flush)
+
+    @callback
+    def _flush(self):
+        self._handle = None
+        if self._entity.hass is None:
+            return
+
+        snapshot = self._snapshot()
+        if snapshot == self._published:
+            return
+
+        self._published = snapshot
+        self._entity.async_write_ha_state()
+
+    @callback
+    def cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
@@ -17,6 +17,7 @@ async def test():
     logger.info(f"Testing scanner")
     async for (ip, mac) in scanner.get_devices():
         logger.info(f"found ip: {ip} - {mac}")
+    await scanner.close()
 
 
 asyncio.run(test())
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class _IntegrationPackageAsDirectory:
+    """Collect the repository root as a plain directory.
+
+    The root is the integration package; collecting it as a package would
+    import its __init__, and with it Home Assistant. The tests only need `somfy`.
+    """
+
+    @staticmethod
+    def pytest_collect_directory(path, parent):
+        if path == ROOT:
+            return pytest.Dir.from_parent(parent, path=path)
+
+
+def pytest_configure(config):
+    # Hooks in this conftest only apply below tests/; a registered plugin applies to the root too.
+    config.pluginmanager.register(_IntegrationPackageAsDirectory(), "somfy-integration-package")
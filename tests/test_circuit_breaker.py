@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from somfy.classes.CircuitBreaker import CircuitBreaker, CircuitState
+
+
+def test_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, base_backoff=5)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.available
+    breaker.record_failure()
+    assert breaker.state == CircuitState.open
+    assert not breaker.allow_request()
+    assert 4 <= breaker.seconds_until_retry() <= 6
+
+
+def test_half_open_trial_after_backoff():
+    breaker = CircuitBreaker(failure_threshold=1, base_backoff=5)
+    with patch("somfy.classes.CircuitBreaker.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+    with patch("somfy.classes.CircuitBreaker.time.monotonic", return_value=110.0):
+        assert breaker.allow_request()
+        assert breaker.state == CircuitState.half_open
+        # Only one trial at a time.
+        assert not breaker.allow_request()
+
+
+def test_trial_success_closes_and_failure_doubles_backoff():
+    breaker = CircuitBreaker(failure_threshold=1, base_backoff=5, max_backoff=300)
+    with patch("somfy.classes.CircuitBreaker.random.uniform", return_value=1.0), \
+            patch("somfy.classes.CircuitBreaker.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+        assert breaker.retry_at == 105.0
+        breaker.state = CircuitState.half_open
+        breaker.record_failure()
+        assert breaker.retry_at == 110.0
+
+    breaker.state = CircuitState.half_open
+    breaker.record_success()
+    assert breaker.available
+    assert breaker.failures == 0 and breaker.trips == 0
+
+
+def test_backoff_is_capped():
+    breaker = CircuitBreaker(failure_threshold=1, base_backoff=5, max_backoff=20)
+    with patch("somfy.classes.CircuitBreaker.random.uniform", return_value=1.0), \
+            patch("somfy.classes.CircuitBreaker.time.monotonic", return_value=0.0):
+        for _ in range(10):
+            breaker.record_failure()
+        assert breaker.retry_at == 20.0
+
+
+def test_aborted_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, base_backoff=0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.abort_trial()
+    assert breaker.state == CircuitState.open
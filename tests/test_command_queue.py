@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from somfy.classes.CommandQueue import CommandQueue
+
+
+class StubClient:
+    ip = "10.0.0.2"
+    name = "Stub"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.release = None
+
+    async def send_command(self, command, **params):
+        self.sent.append(command)
+        if self.release is not None:
+            await self.release.wait()
+        await asyncio.sleep(self.delay)
+        return {"result": True, "method": command}
+
+
+async def _queued(queue, command, **params):
+    """Submit without waiting, then let the submission run up to its await."""
+    task = asyncio.ensure_future(queue.submit(command, **params))
+    await asyncio.sleep(0)
+    return task
+
+
+def test_later_move_replaces_queued_move():
+    async def run():
+        client = StubClient()
+        client.release = asyncio.Event()
+        queue = CommandQueue(client, min_spacing=0)
+        first = await _queued(queue, "move.up")
+        second = await _queued(queue, "move.to", position=30)
+        third = await _queued(queue, "move.to", position=60)
+        client.release.set()
+        return client.sent, await first, await second, await third
+
+    sent, first, second, third = asyncio.run(run())
+    assert sent == ["move.up", "move.to"]
+    assert first.command == "move.up"
+    # The superseded slider value learns which command was really sent.
+    assert (second.command, second.params) == ("move.to", {"position": 60})
+    assert third == second
+
+
+def test_queued_stop_is_never_dropped():
+    async def run():
+        client = StubClient()
+        client.release = asyncio.Event()
+        queue = CommandQueue(client, min_spacing=0)
+        down = await _queued(queue, "move.down")
+        stop = await _queued(queue, "move.stop")
+        up = await _queued(queue, "move.up")
+        client.release.set()
+        return client.sent, await down, await stop, await up
+
+    sent, down, stop, up = asyncio.run(run())
+    assert sent == ["move.down", "move.stop", "move.up"]
+    assert stop.command == "move.stop"
+    assert up.command == "move.up"
+
+
+def test_stop_drops_queued_moves_and_merges_with_queued_stop():
+    async def run():
+        client = StubClient()
+        client.release = asyncio.Event()
+        queue = CommandQueue(client, min_spacing=0)
+        await _queued(queue, "status.position")
+        stop = await _queued(queue, "move.stop")
+        up = await _queued(queue, "move.up")
+        second_stop = await _queued(queue, "move.stop")
+        client.release.set()
+        return client.sent, await stop, await up, await second_stop
+
+    sent, stop, up, second_stop = asyncio.run(run())
+    assert sent == ["status.position", "move.stop"]
+    assert stop.command == up.command == second_stop.command == "move.stop"
+
+
+def test_send_command_returns_client_result():
+    async def run():
+        queue = CommandQueue(StubClient(), min_spacing=0)
+        return await queue.send_command("status.position")
+
+    assert asyncio.run(run()) == {"result": True, "method": "status.position"}
+
+
+def test_commands_are_spaced():
+    async def run():
+        loop = asyncio.get_running_loop()
+        queue = CommandQueue(StubClient(), min_spacing=0.05)
+        started = loop.time()
+        await asyncio.gather(queue.send_command("status.position"), queue.send_command("status.info"))
+        return loop.time() - started
+
+    assert asyncio.run(run()) >= 0.05
+
+
+def test_cancel_resolves_in_flight_and_queued_callers():
+    async def run():
+        client = StubClient()
+        client.release = asyncio.Event()
+        queue = CommandQueue(client, min_spacing=0)
+        in_flight = await _queued(queue, "move.up")
+        queued = await _queued(queue, "status.position")
+        queue.cancel()
+        done, pending = await asyncio.wait([in_flight, queued], timeout=1)
+        return done, pending
+
+    done, pending = asyncio.run(run())
+    assert not pending
+    for task in done:
+        with pytest.raises(asyncio.CancelledError):
+            task.result()
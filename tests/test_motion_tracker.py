@@ -0,0 +1,42 @@
+from somfy.classes.MotionTracker import MotionTracker, MAX_EXTRAPOLATION
+
+
+def test_estimate_follows_direction_and_speed():
+    tracker = MotionTracker(default_speed=10)
+    tracker.update(20, 1, at=0)
+    assert tracker.estimate(at=1) == 30
+
+
+def test_estimate_stops_at_target():
+    tracker = MotionTracker(default_speed=10)
+    tracker.update(50, 0, at=0)
+    tracker.start(-1, target=45, at=0)
+    assert tracker.estimate(at=1.5) == 45
+
+
+def test_estimate_stops_at_end_of_travel():
+    tracker = MotionTracker(default_speed=50)
+    tracker.update(90, 1, at=0)
+    assert tracker.estimate(at=1) == 100
+
+
+def test_extrapolation_is_bounded():
+    tracker = MotionTracker(default_speed=1)
+    tracker.update(0, 1, at=0)
+    assert tracker.estimate(at=60) == MAX_EXTRAPOLATION
+
+
+def test_speed_is_learned_from_readings():
+    tracker = MotionTracker(default_speed=5)
+    tracker.update(0, 1, at=0)
+    tracker.update(15, 1, at=1)
+    assert tracker.speed == 10
+
+
+def test_stopping_clears_target():
+    tracker = MotionTracker()
+    tracker.update(10, 0, at=0)
+    tracker.start(1, target=80, at=0)
+    tracker.update(40, 0, at=3)
+    assert tracker.target is None
+    assert tracker.estimate(at=10) == 40